@@ -0,0 +1,269 @@
+import argparse
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from core import correlation
+from core import data_cache
+from core import figure_cache
+from core import reloader
+from core import views
+
+# JSON API over the numbers the dashboards show, computed by the same functions
+# in views.py.
+#
+#   python api.py --port 8502
+#   curl 'localhost:8502/api/g20?year=2021'
+#   curl 'localhost:8502/api/sectors?year=2020'
+#   curl 'localhost:8502/api/imports/top?year=2021&n=3'
+#   curl 'localhost:8502/api/correlated?sector=C.%20Industri%20Pengolahan'
+#
+# Query parameters are validated before anything else, so a bad request gets a
+# 400 whatever its If-None-Match. Every response carries an ETag derived from the
+# route, its parsed parameters and the content hash (data_cache.version) of the
+# files the route reads, so it changes exactly when the answer can. A matching If-None-Match gets a 304
+# without computing anything, and rendered bodies are kept in a bounded LRU keyed
+# by that ETag. The server runs reloader.py, so new files in data_source/ are
+# picked up without a restart. benchmarks/api_load.py load-tests a running server.
+
+DEFAULT_PORT = 8502
+MAX_ENTRIES = 256
+
+_lock = threading.Lock()
+_responses = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "not_modified": 0, "evictions": 0}
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _year(params):
+    year = params.get("year", views.YEARS[0])
+    if year not in views.YEARS:
+        raise ValueError("year must be one of {}".format(", ".join(views.YEARS)))
+    return year
+
+
+def _parse_number(params, name, default, kind):
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        return kind(value)
+    except ValueError:
+        raise ValueError("{} must be {}, got {}".format(name, "an integer" if kind is int else "a number", value)) from None
+
+
+# Each route has a parser, which validates the query string and returns the
+# handler's arguments (or raises ValueError with the message for the 400), and a
+# handler, which computes the response from those arguments.
+
+def _year_args(params):
+    return {"year": _year(params)}
+
+
+def g20(year):
+    gdp = views.gdp_ranking()
+    top = gdp.top(year, 20)
+    previous_year = str(int(year) - 1)
+    return {
+        "year": year,
+        "indonesia": {
+            "value": _number(gdp.value("IDN", year)),
+            "rank": gdp.rank_of("IDN", year) + 1,
+            "previous_value": _number(gdp.value("IDN", previous_year)),
+            "previous_rank": gdp.rank_of("IDN", previous_year) + 1,
+        },
+        "countries": [
+            {"rank": i + 1, "country": name, "code": code, "value": _number(value)}
+            for i, (name, code, value) in enumerate(zip(top["Country Name"], top["Country Code"], top[year]))
+        ],
+    }
+
+
+def sectors(year):
+    df = views.pdb_breakdown(year)
+    return {
+        "year": year,
+        "unit": "Miliar Rp",
+        "sectors": [{"lapangan_usaha": label, "value": int(value)} for label, value in zip(df["lapangan_usaha"], df[year])],
+    }
+
+
+def _top_imports_args(params):
+    n = _parse_number(params, "n", 3, int)
+    # bounded, since every distinct n is cached by topk and in the response LRU
+    groups = len(views.impor_options())
+    if not 1 <= n <= groups:
+        raise ValueError("n must be between 1 and {}".format(groups))
+    return {"year": _year(params), "n": n}
+
+
+def top_imports(year, n):
+    df = views.impor_breakdown(year, n)
+    return {
+        "year": year,
+        "unit": "Ton",
+        "imports": [{"golongan_sitc": label, "value": int(value)} for label, value in zip(df["golongan_sitc"], df[year])],
+    }
+
+
+def _correlated_args(params):
+    sector = params.get("sector")
+    if sector not in views.sector_options():
+        raise ValueError("sector must be one of {}".format(", ".join(views.sector_options())))
+    min_r = _parse_number(params, "min_r", correlation.DEFAULT_MIN_R, float)
+    if math.isnan(min_r):
+        raise ValueError("min_r must be a number, got {}".format(params["min_r"]))
+    return {"sector": sector, "min_r": min_r}
+
+
+def correlated(sector, min_r):
+    row = views.correlated_imports(sector, min_r)
+    return {
+        "sector": sector,
+        "min_r": min_r,
+        "imports": [{"golongan_sitc": label, "r": _number(r)} for label, r in row.items()],
+    }
+
+
+# path -> (parser, handler, files it reads)
+ROUTES = {
+    "/api/g20": (_year_args, g20, (views.GDP_FILE,)),
+    "/api/sectors": (_year_args, sectors, (views.PDB_FILE,)),
+    "/api/imports/top": (_top_imports_args, top_imports, (views.IMPOR_FILE,)),
+    "/api/correlated": (_correlated_args, correlated, (views.PDB_FILE, views.IMPOR_FILE)),
+}
+
+
+def etag(path, args, inputs):
+    # from the parsed arguments, so equivalent query strings (n=03, n=3) share it
+    digest = hashlib.sha1(json.dumps([path, sorted(args.items())]).encode())
+    for source in inputs:
+        digest.update(data_cache.version(source).encode())
+    return '"{}"'.format(digest.hexdigest())
+
+
+def respond(path, params, if_none_match=None):
+    # -> (status, headers, body)
+    if path == "/api":
+        return 200, {}, json.dumps({"routes": sorted(ROUTES) + ["/api/stats"]}).encode()
+    if path == "/api/stats":
+        return 200, {}, json.dumps({
+            "responses": stats(),
+            "data_cache": data_cache.stats(),
+            "figure_cache": figure_cache.stats(),
+            "reloader": reloader.status(),
+        }).encode()
+    if path not in ROUTES:
+        return 404, {}, json.dumps({"error": "unknown route {}".format(path)}).encode()
+
+    # parameters first: a bad request gets its 400 even with a matching ETag
+    parse, handler, inputs = ROUTES[path]
+    try:
+        args = parse(params)
+    except ValueError as error:
+        return 400, {}, json.dumps({"error": error.args[0]}).encode()
+
+    tag = etag(path, args, inputs)
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if if_none_match is not None and tag in [value.strip() for value in if_none_match.split(",")]:
+        with _lock:
+            _stats["not_modified"] += 1
+        return 304, headers, b""
+
+    with _lock:
+        body = _responses.get(tag)
+        if body is not None:
+            _responses.move_to_end(tag)
+            _stats["hits"] += 1
+            return 200, headers, body
+
+    body = json.dumps(handler(**args), separators=(",", ":")).encode()
+
+    with _lock:
+        _stats["misses"] += 1
+        _responses[tag] = body
+        while len(_responses) > MAX_ENTRIES:
+            _responses.popitem(last=False)
+            _stats["evictions"] += 1
+    return 200, headers, body
+
+
+def stats():
+    with _lock:
+        return dict(_stats, entries=len(_responses), bytes=sum(len(body) for body in _responses.values()))
+
+
+def clear():
+    with _lock:
+        _responses.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients wait ~40 ms for the delayed ACK on every response
+    disable_nagle_algorithm = True
+    quiet = False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        data_cache.pin()
+        try:
+            status, headers, body = respond(url.path.rstrip("/") or "/api", dict(parse_qsl(url.query)),
+                                            self.headers.get("If-None-Match"))
+        finally:
+            data_cache.unpin()
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def serve(host="127.0.0.1", port=DEFAULT_PORT, quiet=False):
+    reloader.start(views.warm, sources=views.SOURCES)
+    Handler.quiet = quiet
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the dashboard computations as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--quiet", action="store_true", help="do not log every request")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.quiet)
+    print("serving on http://{}:{}/api".format(*server.server_address[:2]))
+    started = time.time()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("stopped after {:.0f} s: {}".format(time.time() - started, stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import http.client
+import itertools
+import os
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+# Load test for api.py.
+#
+#   python benchmarks/api_load.py                          # starts a server in-process
+#   python benchmarks/api_load.py --url http://127.0.0.1:8502 -c 16 -d 30
+#   python benchmarks/api_load.py --revalidate             # send If-None-Match
+#
+# Each client thread keeps one HTTP/1.1 connection open and cycles through every
+# route and widget value; with --revalidate it replays the ETag it last saw for a
+# URL, the way a browser or CDN would. Requests/sec and latency percentiles are
+# reported per route and overall.
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _urls():
+    sys.path.insert(0, REPO_DIR)
+    from core import views
+
+    urls = []
+    for year in views.YEARS:
+        urls += ["/api/g20?year={}".format(year), "/api/sectors?year={}".format(year), "/api/imports/top?year={}&n=3".format(year)]
+    urls += ["/api/correlated?sector={}".format(quote(sector)) for sector in views.sector_options()]
+    return urls
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _client(host, port, urls, deadline, revalidate, results, offset):
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    etags = {}
+    for url in itertools.islice(itertools.cycle(urls), offset, None):
+        if time.perf_counter() >= deadline:
+            break
+        headers = {"If-None-Match": etags[url]} if revalidate and url in etags else {}
+        started = time.perf_counter()
+        connection.request("GET", url, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if response.getheader("ETag"):
+            etags[url] = response.getheader("ETag")
+        results.append((url.split("?")[0], response.status, elapsed_ms))
+    connection.close()
+
+
+def run(host, port, concurrency, duration, revalidate):
+    urls = _urls()
+    results = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(target=_client, args=(host, port, urls, deadline, revalidate, results, i * len(urls) // concurrency))
+        for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print("{} clients, {:.1f} s{}".format(concurrency, elapsed, ", revalidating" if revalidate else ""))
+    print("{:<20} {:>8} {:>10} {:>9} {:>9} {:>9}  statuses".format("route", "requests", "req/s", "p50 ms", "p99 ms", "max ms"))
+    routes = sorted({route for route, _, _ in results})
+    for route in routes + ["(all)"]:
+        rows = [row for row in results if route == "(all)" or row[0] == route]
+        latencies = [elapsed_ms for _, _, elapsed_ms in rows]
+        statuses = {}
+        for _, status, _ in rows:
+            statuses[status] = statuses.get(status, 0) + 1
+        print("{:<20} {:>8} {:>10.1f} {:>9.2f} {:>9.2f} {:>9.2f}  {}".format(
+            route, len(rows), len(rows) / elapsed, statistics.median(latencies),
+            _percentile(latencies, 0.99), max(latencies), statuses))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the dashboard JSON API.")
+    parser.add_argument("--url", help="running server to test (default: start one in-process)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-d", "--duration", type=float, default=10)
+    parser.add_argument("--revalidate", action="store_true", help="send If-None-Match with the last ETag seen")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        os.chdir(REPO_DIR)
+        sys.path.insert(0, REPO_DIR)
+        import api
+
+        server = api.serve(port=0, quiet=True)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        run(host, port, args.concurrency, args.duration, args.revalidate)
+    finally:
+        if server is not None:
+            print("server cache: {}".format(api.stats()))
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Start-up import cost of the dashboards, measured with `python -X importtime` in a
+# fresh interpreter per run.
+#
+#   python benchmarks/import_time.py                 # compare every profile
+#   python benchmarks/import_time.py --top 15 current
+#
+# "baseline" replays the imports the scripts used to do at module top (seaborn,
+# matplotlib.pyplot, json.tool and the pycountry walk); "current" is what main.py
+# imports now, including core.views and everything it pulls in (spec_cache,
+# pipeline, hs_imports, forecast, ...). Keep it in step with main.py.
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILES = {
+    "baseline": "\n".join([
+        "from json import tool",
+        "import streamlit, pandas, altair, re",
+        "from PIL import Image",
+        "from numerize import numerize",
+        "import seaborn",
+        "import matplotlib.pyplot",
+        "import pycountry",
+        "country_codes = list(map(lambda x: x.alpha_3, pycountry.countries))",
+    ]),
+    "current": "\n".join([
+        "import streamlit, pandas, altair, re",
+        "from PIL import Image",
+        "from core import data_cache, spans, reloader, spec_cache, countries, figure_cache, charts, views",
+        "country_codes = countries.iso3_codes()",
+    ]),
+}
+
+
+def run_once(statement):
+    # The statement is also timed as a whole so work done outside imports (such as
+    # walking the pycountry database) shows up in the wall time.
+    timed = "import time\n_started = time.perf_counter()\n{}\nprint(time.perf_counter() - _started)".format(statement)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", timed],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True,
+    )
+
+    # "import time: self [us] | cumulative | imported package"; top-level
+    # packages are the lines without leading indentation in the last column.
+    per_module = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("  "):
+            continue
+        per_module[name.strip()] = per_module.get(name.strip(), 0) + int(cumulative)
+    return per_module, float(result.stdout.split()[-1])
+
+
+def measure(statement, repeat):
+    runs = [run_once(statement) for _ in range(repeat)]
+    modules = set().union(*(per_module for per_module, _ in runs))
+    per_module = {name: statistics.median(run.get(name, 0) for run, _ in runs) for name in modules}
+    return per_module, statistics.median(wall for _, wall in runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module import time of the dashboard start-up path.")
+    parser.add_argument("profiles", nargs="*", default=list(PROFILES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals = {}
+    for profile in args.profiles:
+        per_module, wall = measure(PROFILES[profile], args.repeat)
+        totals[profile] = wall
+
+        print("== {} (median of {} runs)".format(profile, args.repeat))
+        for name, micros in sorted(per_module.items(), key=lambda item: -item[1])[:args.top]:
+            print("  {:<30} {:>9.1f} ms".format(name, micros / 1000))
+        print("  {:<30} {:>9.1f} ms".format("wall (imports + setup)", wall * 1000))
+
+    if "baseline" in totals and "current" in totals:
+        print("\ncurrent vs baseline: {:.1f} ms saved ({:.0%})".format(
+            (totals["baseline"] - totals["current"]) * 1000,
+            1 - totals["current"] / totals["baseline"],
+        ))
+
+
+if __name__ == "__main__":
+    main()
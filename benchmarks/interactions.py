@@ -0,0 +1,220 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Per-interaction cost of the dashboards, driven headlessly with Streamlit's AppTest.
+#
+#   python benchmarks/interactions.py -o before.json
+#   python benchmarks/interactions.py -o after.json pages/2_Laju_PDB_dan_Impor.py
+#   python benchmarks/interactions.py --compare before.json after.json
+#
+# Every script is run once for its initial render, then each scripted interaction
+# (a widget label and value) is applied and the rerun measured: wall time, process
+# CPU time, bytes of Vega-Lite chart messages emitted and peak Python memory
+# (tracemalloc, taken from a separate rerun so it does not skew the timings).
+# Pages built from core.sections also report how many sections recomputed, and
+# every chart drawn through core.charts.altair_chart its spec size.
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YEARS = [str(year) for year in range(2021, 2009, -1)]
+SLIDER_YEARS = [str(year) for year in range(2001, 2022)]
+
+
+def _slider_ranges(full):
+    if full:
+        return [(start, end) for i, start in enumerate(SLIDER_YEARS) for end in SLIDER_YEARS[i:]]
+    # every start with the last year, and the first year with every end
+    return sorted({(start, SLIDER_YEARS[-1]) for start in SLIDER_YEARS} | {(SLIDER_YEARS[0], end) for end in SLIDER_YEARS})
+
+
+def scenarios(full=False):
+    # script -> [(widget type, label, [values])]; an empty value list means every
+    # option the widget offers.
+    return {
+        "main.py": [
+            ("select_slider", "Pilih tahun untuk melihat PDB 5 tahun terakhir!", []),
+            ("select_slider", "Geser Slider dibawah untuk melihat periode rentang tahun!", _slider_ranges(full)),
+            ("select_slider", "Pilih Tahun untuk melihat detail import!", []),
+        ],
+        "pages/1_Uji_Korelasi.py": [
+            ("selectbox", "Pilih Tahun:", YEARS),
+            ("selectbox", "Tahun", YEARS),
+            ("selectbox", "Sektor PDB", []),
+            ("selectbox", "Sektor Impor", []),
+        ],
+        "pages/2_Laju_PDB_dan_Impor.py": [
+            ("selectbox", "Pilih Tahun:", YEARS),
+            ("selectbox", "Tahun", YEARS),
+            ("selectbox", "Tahun Impor", YEARS),
+            ("selectbox", "Sektor PDB", []),
+        ],
+    }
+
+
+def _widget(app, kind, label):
+    for widget in getattr(app, kind):
+        if widget.label == label:
+            return widget
+    raise LookupError("{} {!r} not found".format(kind, label))
+
+
+def _chart_bytes(app):
+    return sum(chart.proto.ByteSize() for chart in app.get("arrow_vega_lite_chart"))
+
+
+def _measure(app, memory):
+    from core import charts
+
+    charts.spec_bytes.clear()
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    app.run()
+    wall, cpu = time.perf_counter() - wall_started, time.process_time() - cpu_started
+    result = {
+        "wall_ms": wall * 1000,
+        "cpu_ms": cpu * 1000,
+        "chart_bytes": _chart_bytes(app),
+        "spec_bytes": dict(charts.spec_bytes),
+        "exceptions": [str(exception.value) for exception in app.exception],
+    }
+    # pages built from core.sections record which sections recomputed
+    if "_sections" in app.session_state:
+        result["sections_recomputed"] = len(app.session_state["_sections"]["history"][-1]["recomputed"])
+
+    # tracemalloc slows Python down several times over, so peak memory comes
+    # from a second, traced rerun of the same widget state.
+    if memory:
+        tracemalloc.start()
+        app.run()
+        result["peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return result
+
+
+def run_script(script, interactions, timeout, memory):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(REPO_DIR, script), default_timeout=timeout)
+    results = [dict(_measure(app, memory), widget="(initial)", value=None)]
+
+    for kind, label, values in interactions:
+        for value in values or list(_widget(app, kind, label).options):
+            widget = _widget(app, kind, label)
+            if isinstance(value, tuple):
+                widget.set_range(*value)
+            else:
+                widget.set_value(value)
+            result = _measure(app, memory)
+            results.append(dict(result, widget=label, value=list(value) if isinstance(value, tuple) else value))
+    return results
+
+
+def summarize(results):
+    summary = {}
+    for key in ("wall_ms", "cpu_ms", "peak_kb", "chart_bytes", "sections_recomputed"):
+        values = [result[key] for result in results if result["widget"] != "(initial)" and key in result]
+        if values:
+            summary[key] = {
+                "mean": statistics.fmean(values),
+                "p50": statistics.median(values),
+                "max": max(values),
+            }
+    # per chart, over every run that drew it (the initial render included)
+    names = sorted({name for result in results for name in result.get("spec_bytes", {})})
+    summary["spec_bytes"] = {
+        name: statistics.fmean(result["spec_bytes"][name] for result in results if name in result.get("spec_bytes", {}))
+        for name in names
+    }
+    return summary
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scripts, full, timeout, memory=True):
+    import streamlit
+
+    os.chdir(REPO_DIR)
+    sys.path.insert(0, REPO_DIR)
+    from core import charts
+
+    # Altair charts outside spec_cache are serialized once more to be measured
+    charts.measure_specs = True
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "data_store": os.path.exists(os.path.join(REPO_DIR, "data_store", "index.json")),
+        },
+        "scripts": {},
+    }
+    for script, interactions in scenarios(full).items():
+        if scripts and script not in scripts:
+            continue
+        results = run_script(script, interactions, timeout, memory)
+        report["scripts"][script] = {"summary": summarize(results), "interactions": results}
+
+        summary = report["scripts"][script]["summary"]
+        failures = sum(1 for result in results if result["exceptions"])
+        print("{:<12} {:>4} interactions  wall p50 {:>7.1f} ms  cpu p50 {:>7.1f} ms  peak max {:>8} KB  charts mean {:>8.0f} B  errors {}".format(
+            script, len(results) - 1, summary["wall_ms"]["p50"], summary["cpu_ms"]["p50"],
+            "{:.0f}".format(summary["peak_kb"]["max"]) if "peak_kb" in summary else "-",
+            summary["chart_bytes"]["mean"], failures,
+        ))
+        for name, size in summary["spec_bytes"].items():
+            print("{:<12}   spec {:<16} {:>8.0f} B".format("", name, size))
+    return report
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print("{:<12} {:<12} {:>12} {:>12} {:>9}".format("script", "metric", "before", "after", "change"))
+    for script in sorted(set(before["scripts"]) & set(after["scripts"])):
+        for metric in ("wall_ms", "cpu_ms", "peak_kb", "chart_bytes", "sections_recomputed"):
+            if metric not in before["scripts"][script]["summary"] or metric not in after["scripts"][script]["summary"]:
+                continue
+            old = before["scripts"][script]["summary"][metric]["mean"]
+            new = after["scripts"][script]["summary"][metric]["mean"]
+            change = (new - old) / old if old else 0.0
+            print("{:<12} {:<12} {:>12.1f} {:>12.1f} {:>+8.1%}".format(script, metric, old, new, change))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless per-interaction benchmark of the dashboards.")
+    parser.add_argument("scripts", nargs="*", help="subset of scripts to run (default: all)")
+    parser.add_argument("-o", "--output", help="write the JSON report here")
+    parser.add_argument("--full", action="store_true", help="every start/end pair of main.py's range slider")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced rerun that measures peak memory")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    output = os.path.abspath(args.output) if args.output else None
+    report = run(args.scripts, args.full, args.timeout, not args.no_memory)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Memory and latency of the multi-page app against one process per page.
+#
+#   python benchmarks/pages.py                 # both setups, 3 rounds
+#   python benchmarks/pages.py --rounds 5
+#
+# "separate" starts a fresh interpreter per page, like the old deployment of
+# main.py, main-v2.py and main-v3.py as three apps, and renders only that page.
+# "shared" renders every page in one interpreter, round after round, the way a
+# user switching pages hits a single Streamlit server: the first round pays for
+# loading data and building the derived tables, later rounds reuse them. Each
+# render is a headless AppTest run; RSS is read after every render.
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["main.py", "pages/1_Uji_Korelasi.py", "pages/2_Laju_PDB_dan_Impor.py"]
+
+
+def _worker(pages, rounds):
+    sys.path.insert(0, REPO_DIR)
+    from streamlit.testing.v1 import AppTest
+
+    from core import spans
+
+    results = []
+    for round_number in range(rounds):
+        for page in pages:
+            started = time.perf_counter()
+            app = AppTest.from_file(page, default_timeout=120).run()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if app.exception:
+                raise RuntimeError("{}: {}".format(page, app.exception[0].value))
+            results.append({"round": round_number, "page": page, "ms": elapsed_ms, "rss_mb": spans.rss_mb()})
+    print(json.dumps(results))
+
+
+def _run(pages, rounds):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", "--rounds", str(rounds)] + pages,
+        cwd=REPO_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _report(title, results, pages):
+    print(title)
+    print("{:<32} {:>10} {:>12} {:>9}".format("page", "first ms", "revisit ms", "RSS MB"))
+    for page in pages:
+        rows = [row for row in results if row["page"] == page]
+        revisits = [row["ms"] for row in rows if row["round"] > 0]
+        print("{:<32} {:>10.0f} {:>12} {:>9.0f}".format(
+            page, rows[0]["ms"], "{:.0f}".format(statistics.median(revisits)) if revisits else "-", rows[-1]["rss_mb"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the multi-page app with one process per page.")
+    parser.add_argument("--rounds", type=int, default=3, help="times every page is rendered")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("pages", nargs="*", default=PAGES)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.pages, args.rounds)
+        return
+
+    separate = []
+    for page in args.pages:
+        separate += _run([page], args.rounds)
+    _report("separate: one process per page", separate, args.pages)
+    separate_rss = sum(max(row["rss_mb"] for row in separate if row["page"] == page) for page in args.pages)
+    print("total RSS {:.0f} MB in {} processes\n".format(separate_rss, len(args.pages)))
+
+    shared = _run(args.pages, args.rounds)
+    _report("shared: every page in one process", shared, args.pages)
+    shared_rss = max(row["rss_mb"] for row in shared)
+    print("total RSS {:.0f} MB in 1 process ({:+.0f} MB, {:.0%} of separate)".format(
+        shared_rss, shared_rss - separate_rss, shared_rss / separate_rss))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# Shared code of the dashboard pages, api.py and export.py: data access
+# (data_cache, data_store, reloader, hs_imports), derived tables (ranking, topk,
+# correlation, cube, windowed, forecast), chart builders (charts, figure_cache)
+# and the per-section view models (views).
+#
+# Every page runs in the same Streamlit process, so the module-level caches in
+# here are shared: a frame loaded or a chart built on one page is reused when
+# another page is opened.
@@ -0,0 +1,324 @@
+import json
+
+import altair as alt
+import streamlit as st
+
+from . import spans
+from . import spec_cache
+
+# Chart builders for the dashboards.
+#
+# Every builder hands Altair a frame trimmed to the columns its encodings use, and
+# layered charts attach that frame once on the top-level layer instead of on each
+# sub-chart, so the spec carries each dataset a single time. Filtering, melting
+# and maxima are computed in pandas before the chart is built; the only
+# in-browser transform left is the hover selection filter.
+
+HIGHLIGHT_COLOR = '#F25757'
+BASE_COLOR = '#465A65'
+
+# chart name -> bytes of its last serialized spec. Specs from spec_cache carry
+# their size; an Altair chart is serialized an extra time to measure it, so that
+# only happens while profiling (?profile=1) or when a benchmark sets
+# measure_specs.
+spec_bytes = {}
+measure_specs = False
+
+
+def spec_size(chart):
+    return len(json.dumps(chart.to_dict(), separators=(",", ":")))
+
+
+def altair_chart(chart, name, **kwargs):
+    # st.altair_chart that records the serialized spec size of each chart;
+    # specs from spec_cache are already serialized and go to st.vega_lite_chart
+    with spans.span("altair_chart: {}".format(name)):
+        if isinstance(chart, spec_cache.Spec):
+            spec_bytes[name] = chart.size
+            st.vega_lite_chart(chart.to_dict(), **kwargs)
+            return
+        if measure_specs or spans.active():
+            spec_bytes[name] = spec_size(chart)
+        st.altair_chart(chart, **kwargs)
+
+
+def report():
+    # shown with the profiling panel (?profile=1)
+    if not spans.active() or not spec_bytes:
+        return
+    with st.sidebar.expander("Ukuran spec chart: {:.0f} KB".format(sum(spec_bytes.values()) / 1024)):
+        st.dataframe([
+            {"chart": name, "KB": round(size / 1024, 1)}
+            for name, size in sorted(spec_bytes.items(), key=lambda item: -item[1])
+        ])
+
+
+@spans.timed
+def makeG20Chart(df_gdp, highlight=("Indonesia",), tooltip_format="$.3s"):
+    df_gdp = df_gdp.loc[:, ["Country Name", "US$"]]
+
+    return alt.Chart(df_gdp).mark_bar().encode(
+        y=alt.Y('Country Name:N', sort="-x"),
+        x=alt.X('US$', axis=alt.Axis(format='$.2s')),
+        color=alt.condition(
+            alt.FieldOneOfPredicate(field="Country Name", oneOf=list(highlight)),
+            alt.value(HIGHLIGHT_COLOR),
+            alt.value(BASE_COLOR)
+        ),
+        tooltip=[
+            alt.Tooltip("Country Name", title="Country Name"),
+            alt.Tooltip("US$", title="US$", format=tooltip_format),
+        ],
+    )
+
+
+@spans.timed
+def make_sector_chart(data):
+    data = data.loc[:, ["year", "variable", "value"]]
+
+    hover = alt.selection_single(
+        fields=["year"],
+        nearest=True,
+        on="mouseover",
+        empty="none",
+    )
+
+    lines = (
+        alt.Chart()
+        .mark_line()
+        .encode(
+            x="year",
+            y="value",
+            color="variable",
+        )
+    )
+
+    # Draw points on the line, and highlight based on selection
+    points = lines.transform_filter(hover).mark_circle(size=65)
+
+    # Draw a rule at the location of the selection
+    tooltips = (
+        alt.Chart()
+        .mark_rule()
+        .encode(
+            x="year",
+            y="value",
+            opacity=alt.condition(hover, alt.value(0.3), alt.value(0)),
+            tooltip=[
+                alt.Tooltip("year", title="Year"),
+                alt.Tooltip("value", title="\\% Based of PDB"),
+            ],
+        )
+        .add_selection(hover)
+    )
+    return alt.layer(lines, points, tooltips, data=data, title="Angka Sektor Penopang PDB").interactive()
+
+
+@spans.timed
+def makeDetailImportChart(df_import):
+    return alt.Chart(df_import).mark_bar().encode(
+        y=alt.Y('nama_data:N', sort="-x"),
+        x=alt.X('Million US$'),
+
+        tooltip=[
+            alt.Tooltip("nama_data", title="Komoditas Barang"),
+            alt.Tooltip("Million US$", title="Million US$", ),
+        ],
+    )
+
+
+@spans.timed
+def makePDBComparisonChart(df_gdp, year):
+    df_gdp = df_gdp.loc[:, ["lapangan_usaha", year]]
+    df_gdp_max = df_gdp[year].max()
+
+    return alt.Chart(df_gdp).mark_bar().encode(
+        y=alt.Y('{}:Q'.format(year), title="Miliar RP", axis=alt.Axis(format='.2s')),
+        x=alt.X('lapangan_usaha',title="Lapangan Usaha", axis=alt.Axis(labelAngle=-45)),
+        tooltip=[
+            alt.Tooltip("lapangan_usaha", title="Lapangan Usaha"),
+            alt.Tooltip(year, title="Nilai (Miliar Rp)", format=".3s"),
+        ],
+        color=alt.condition(
+            alt.datum[year] == df_gdp_max,
+            alt.value(HIGHLIGHT_COLOR),
+            alt.value(BASE_COLOR)
+        ),
+    ).properties(height=400)
+
+
+@spans.timed
+def makeImporBarChart(df_impor, year):
+    df_impor = df_impor.loc[:, ["golongan_sitc", year]]
+    df_impor_max = df_impor[year].max()
+
+    return alt.Chart(df_impor).mark_bar().encode(
+        y=alt.Y('{}:Q'.format(year), title="Volume (Ton)", axis=alt.Axis(format='.2s')),
+        x=alt.X('golongan_sitc',title="Kategori SITC", axis=alt.Axis(labelAngle=-45)),
+        tooltip=[
+            alt.Tooltip("golongan_sitc", title="Kategori SITC"),
+            alt.Tooltip(year, title="Volume (Ton)", format=".3s"),
+        ],
+        color=alt.condition(
+            alt.datum[year] == df_impor_max,
+            alt.value(HIGHLIGHT_COLOR),
+            alt.value(BASE_COLOR)
+        ),
+    ).properties(height=400)
+
+
+def _forecast_layers(forecast, x, y, color, title, number_format):
+    # Projection band and dashed projected line, drawn under the historical line.
+    # `forecast` has the chart's x/y columns plus lower/upper band columns and
+    # starts at the last observed year so the dashed line joins the solid one.
+    tooltip = [alt.Tooltip(x, title="Tahun (proyeksi)")]
+    if isinstance(color, str):
+        tooltip.append(alt.Tooltip(color, title="Golongan SITC"))
+    tooltip += [
+        alt.Tooltip(y, title=title, format=number_format),
+        alt.Tooltip("lower", title="Batas bawah", format=number_format),
+        alt.Tooltip("upper", title="Batas atas", format=number_format),
+    ]
+
+    band = alt.Chart(forecast).mark_area(opacity=0.15).encode(
+        x=alt.X(x),
+        y=alt.Y("lower:Q"),
+        y2="upper:Q",
+        color=color,
+        tooltip=tooltip,
+    )
+    projected = alt.Chart(forecast).mark_line(strokeDash=[4, 3]).encode(
+        x=alt.X(x),
+        y=alt.Y("{}:Q".format(y)),
+        color=color,
+        tooltip=tooltip,
+    )
+    return [band, projected]
+
+
+@spans.timed
+def make_layered_chart_impor(data, forecast=None):
+    data = data.loc[:, ["index", "golongan_sitc", "value"]]
+
+    hover = alt.selection_single(
+        fields=["index"],
+        nearest=True,
+        on="mouseover",
+        empty="none",
+    )
+
+    lines = (
+        alt.Chart()
+        .mark_line()
+        .encode(
+            x=alt.X('index', axis=alt.Axis(title='Year', labelAngle=-45)),
+            y=alt.Y('value:Q', axis=alt.Axis(title='Volume (Ton)', format='.2s')),
+            color="golongan_sitc",
+        )
+    )
+
+    # Draw points on the line, and highlight based on selection
+    points = lines.transform_filter(hover).mark_circle(size=75)
+
+    # Draw a rule at the location of the selection
+    tooltips = (
+        alt.Chart()
+        .mark_rule()
+        .encode(
+            x="index",
+            y="value",
+            opacity=alt.condition(hover, alt.value(0.3), alt.value(0)),
+            tooltip=[
+                alt.Tooltip("index", title="Tahun"),
+                alt.Tooltip("value", title="Volume(Ton)", format='.2s'),
+                alt.Tooltip("golongan_sitc", title="Golongan SITC"),
+            ],
+        )
+        .add_selection(hover)
+    )
+    layers = [lines, points, tooltips]
+    if forecast is not None:
+        layers = _forecast_layers(forecast, "index", "value", "golongan_sitc", "Volume(Ton)", '.2s') + layers
+    return alt.layer(*layers, data=data, title="Angka Impor").properties(width=525).interactive()
+
+
+@spans.timed
+def build_line_chart(df, impor = False, forecast = None):
+    df = df.loc[:, ["x", "y"]]
+    color_string = HIGHLIGHT_COLOR if impor else BASE_COLOR
+    title, unit = ("Angka Impor", "Volume (Ton)") if impor else ("Angka PDB", "Miliar RP")
+
+    lines = alt.Chart().mark_line().encode(
+       x=alt.X('x', axis=alt.Axis(title='Year', labelAngle=-45)),
+       y=alt.Y('y:Q',axis=alt.Axis(title=unit, format='.2s')),
+       color = alt.value(color_string),
+     )
+    hover = alt.selection_single(
+        fields=["x"],
+        nearest=True,
+        on="mouseover",
+        empty="none"
+    )
+
+    points = lines.transform_filter(hover).mark_circle(size=75)
+
+    tooltips = (
+        alt.Chart()
+        .mark_rule()
+        .encode(
+            x='x',
+            y='y',
+            opacity = alt.condition(hover, alt.value(0.3), alt.value(0)),
+            tooltip=[
+                alt.Tooltip("x", title="Year"),
+                alt.Tooltip("y", title=unit, format='.3s'),
+            ],
+        )
+        .add_selection(hover)
+    )
+
+    layers = [lines, points, tooltips]
+    if forecast is not None:
+        layers = _forecast_layers(forecast, "x", "y", alt.value(color_string), unit, '.3s') + layers
+    return alt.layer(*layers, data=df, title=title).interactive()
+
+
+@spans.timed
+def make_lag_heatmap(data, selected=None):
+    # best lag per (lapangan_usaha, golongan_sitc) pair; data has left/right/lag/r
+    opacity = alt.value(1)
+    if selected is not None:
+        opacity = alt.condition(alt.datum.left == selected, alt.value(1), alt.value(0.35))
+
+    return alt.Chart(data).mark_rect().encode(
+        x=alt.X('right:N', axis=alt.Axis(title='Golongan SITC', labelExpr="split(datum.label, '.')[0]", labelAngle=0)),
+        y=alt.Y('left:N', axis=alt.Axis(title='Lapangan Usaha', labelExpr="split(datum.label, '.')[0]")),
+        color=alt.Color('lag:O', scale=alt.Scale(scheme='redblue'), legend=alt.Legend(title='Lag terbaik (tahun)')),
+        opacity=opacity,
+        tooltip=[
+            alt.Tooltip("left", title="Lapangan Usaha"),
+            alt.Tooltip("right", title="Golongan SITC"),
+            alt.Tooltip("lag", title="Lag (tahun)"),
+            alt.Tooltip("r", title="Korelasi", format='.2f'),
+        ],
+    ).properties(title="Lag Korelasi Terkuat PDB vs Impor")
+
+
+@spans.timed
+def make_lag_profile(data):
+    # correlation of one sector against every golongan_sitc at every lag;
+    # data has golongan_sitc/lag/r
+    base = alt.Chart(data).encode(
+        x=alt.X('lag:O', axis=alt.Axis(title='Lag (tahun, + = impor mendahului)', labelAngle=0)),
+        y=alt.Y('golongan_sitc:N', axis=alt.Axis(title=None)),
+    )
+    cells = base.mark_rect().encode(
+        color=alt.Color('r:Q', scale=alt.Scale(scheme='blueorange', domain=[-1, 1]), legend=alt.Legend(title='Korelasi')),
+        tooltip=[
+            alt.Tooltip("golongan_sitc", title="Golongan SITC"),
+            alt.Tooltip("lag", title="Lag (tahun)"),
+            alt.Tooltip("r", title="Korelasi", format='.2f'),
+        ],
+    )
+    labels = base.mark_text(fontSize=9).encode(text=alt.Text('r:Q', format='.2f'))
+    return (cells + labels).properties(title="Korelasi per Lag")
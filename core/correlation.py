@@ -0,0 +1,172 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import data_cache
+
+# Cross-block correlation between two BPS tables (label column followed by year
+# columns), e.g. PDB per lapangan usaha vs import volume per golongan SITC.
+#
+# Only the left x right block is computed, in one matrix product over row-wise
+# standardized arrays, instead of the full square matrix of the joined frame.
+#
+# LaggedCorrelation repeats that for every lag in -MAX_LAG..+MAX_LAG at once: the
+# right table is stacked as one shifted copy per lag (years that fall off the end
+# become NaN) and the pairwise-complete block is computed for the whole stack in
+# a single batched matrix product. Lag k pairs left[year] with right[year - k],
+# so a positive lag means the right series (imports) leads.
+
+DEFAULT_MIN_R = 0.71
+MAX_LAG = 3
+METHODS = ("pearson", "spearman")
+
+
+def _pearson_block(x, y):
+    x_valid = ~np.isnan(x)
+    y_valid = ~np.isnan(y)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if x_valid.all() and y_valid.all():
+            x = x - x.mean(axis=-1, keepdims=True)
+            y = y - y.mean(axis=-1, keepdims=True)
+            x = x / np.linalg.norm(x, axis=-1, keepdims=True)
+            y = y / np.linalg.norm(y, axis=-1, keepdims=True)
+            return x @ np.swapaxes(y, -1, -2)
+
+        # Missing values: pairwise-complete sums, the same rule DataFrame.corr uses.
+        x_mask = x_valid.astype("float64")
+        y_mask = y_valid.astype("float64")
+        x0 = np.where(x_valid, x, 0.0)
+        y0 = np.where(y_valid, y, 0.0)
+
+        y_mask_t = np.swapaxes(y_mask, -1, -2)
+        y0_t = np.swapaxes(y0, -1, -2)
+        n = x_mask @ y_mask_t
+        sum_x = x0 @ y_mask_t
+        sum_y = x_mask @ y0_t
+        cov = x0 @ y0_t - sum_x * sum_y / n
+        var_x = (x0 ** 2) @ y_mask_t - sum_x ** 2 / n
+        var_y = x_mask @ np.swapaxes(y0 ** 2, -1, -2) - sum_y ** 2 / n
+        return cov / np.sqrt(var_x * var_y)
+
+
+def _ranks(values):
+    return pd.DataFrame(values).rank(axis=1).to_numpy(dtype="float64")
+
+
+class CrossCorrelation:
+    def __init__(self, left, right, method="pearson"):
+        if method not in METHODS:
+            raise ValueError("method must be one of {}".format(METHODS))
+
+        years = [column for column in left.columns[1:] if column in right.columns[1:]]
+        x = left[years].to_numpy(dtype="float64")
+        y = right[years].to_numpy(dtype="float64")
+        if method == "spearman":
+            x, y = _ranks(x), _ranks(y)
+
+        self.method = method
+        self.years = years
+        self.left_labels = left.iloc[:, 0].to_numpy()
+        self.right_labels = pd.Index(right.iloc[:, 0])
+        self.left_index = {label: i for i, label in enumerate(self.left_labels)}
+        self.matrix = _pearson_block(x, y)
+
+    def row(self, label):
+        return pd.Series(self.matrix[self.left_index[label]], index=self.right_labels)
+
+    def correlated(self, label, min_r=DEFAULT_MIN_R):
+        row = self.matrix[self.left_index[label]]
+        return self.right_labels[row > min_r]
+
+    def frame(self):
+        return pd.DataFrame(self.matrix, index=self.left_labels, columns=self.right_labels)
+
+
+def _shifted(values, lags):
+    # (rows, years) -> (lags, rows, years) with stack[i][:, t] = values[:, t - lags[i]]
+    rows, years = values.shape
+    stack = np.full((len(lags), rows, years), np.nan)
+    for i, lag in enumerate(lags):
+        if lag >= 0:
+            stack[i, :, lag:] = values[:, :years - lag]
+        else:
+            stack[i, :, :lag] = values[:, -lag:]
+    return stack
+
+
+class LaggedCorrelation:
+    def __init__(self, left, right, max_lag=MAX_LAG):
+        years = sorted(column for column in left.columns[1:] if column in right.columns[1:])
+        if max_lag >= len(years) - 2:
+            raise ValueError("max_lag must leave at least 3 overlapping years")
+
+        self.years = years
+        self.lags = np.arange(-max_lag, max_lag + 1)
+        self.left_labels = left.iloc[:, 0].to_numpy()
+        self.right_labels = pd.Index(right.iloc[:, 0])
+        self.left_index = {label: i for i, label in enumerate(self.left_labels)}
+
+        x = left[years].to_numpy(dtype="float64")
+        y = right[years].to_numpy(dtype="float64")
+        # (lags, left, right)
+        self.matrix = _pearson_block(x[None], _shifted(y, self.lags))
+
+        # strongest co-movement per pair, either sign
+        strength = np.where(np.isnan(self.matrix), -np.inf, np.abs(self.matrix))
+        best = np.argmax(strength, axis=0)
+        self.best_lag = self.lags[best]
+        self.best_r = np.take_along_axis(self.matrix, best[None], axis=0)[0]
+
+    def row(self, label):
+        # right label x lag
+        return pd.DataFrame(self.matrix[:, self.left_index[label], :].T, index=self.right_labels, columns=self.lags)
+
+    def best(self, label):
+        i = self.left_index[label]
+        return pd.DataFrame({"lag": self.best_lag[i], "r": self.best_r[i]}, index=self.right_labels)
+
+    def best_frame(self):
+        # one row per (left, right) pair
+        return pd.DataFrame({
+            "left": np.repeat(self.left_labels, len(self.right_labels)),
+            "right": np.tile(self.right_labels.to_numpy(), len(self.left_labels)),
+            "lag": self.best_lag.reshape(-1),
+            "r": self.best_r.reshape(-1),
+        })
+
+
+_lock = threading.Lock()
+_engines = {}
+
+
+def load(left_path, right_path, method="pearson"):
+    key = (os.path.normpath(left_path), os.path.normpath(right_path), method)
+    versions = (data_cache.version(left_path), data_cache.version(right_path))
+
+    with _lock:
+        cached = _engines.get(key)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+    engine = CrossCorrelation(data_cache.load(left_path), data_cache.load(right_path), method)
+    with _lock:
+        _engines[key] = (versions, engine)
+    return engine
+
+
+def load_lagged(left_path, right_path, max_lag=MAX_LAG):
+    key = (os.path.normpath(left_path), os.path.normpath(right_path), "lagged", max_lag)
+    versions = (data_cache.version(left_path), data_cache.version(right_path))
+
+    with _lock:
+        cached = _engines.get(key)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+    engine = LaggedCorrelation(data_cache.load(left_path), data_cache.load(right_path), max_lag)
+    with _lock:
+        _engines[key] = (versions, engine)
+    return engine
@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+
+# ISO 3166-1 alpha-3 codes of real countries, used to drop World Bank aggregates
+# (regions, income groups, "World", ...) from the indicator files.
+#
+# The codes are shipped as a plain text file next to the data so the dashboards do
+# not import pycountry and walk its database on every start. Regenerate it with
+# `python -m core.countries` after upgrading pycountry.
+
+ISO3_CODES_FILE = os.path.join("data_source", "iso3_codes.txt")
+
+# Peer groups for the comparison views (ISO-3). The EU seat of the G20 is left
+# out because it is not a country in the World Bank files.
+ASEAN = ("BRN", "IDN", "KHM", "LAO", "MMR", "MYS", "PHL", "SGP", "THA", "VNM")
+G20 = (
+    "ARG", "AUS", "BRA", "CAN", "CHN", "DEU", "FRA", "GBR", "IDN", "IND",
+    "ITA", "JPN", "KOR", "MEX", "RUS", "SAU", "TUR", "USA", "ZAF",
+)
+GROUPS = {"ASEAN": ASEAN, "G20": G20}
+
+_iso3_codes = None
+
+
+def iso3_codes():
+    global _iso3_codes
+    if _iso3_codes is None:
+        with open(ISO3_CODES_FILE) as f:
+            _iso3_codes = frozenset(line.strip() for line in f if line.strip())
+    return _iso3_codes
+
+
+class CountryIndex:
+    # Country name / ISO-3 code -> row offset in a dataset, built once per dataset.
+    # Selecting N countries is then one `rows()` call and a single fancy-indexed
+    # gather on the dataset's value array.
+
+    def __init__(self, names, codes):
+        self.names = np.asarray(names, dtype=object)
+        self.codes = np.asarray(codes, dtype=object)
+        self._rows = {}
+        for i, (name, code) in enumerate(zip(self.names, self.codes)):
+            self._rows[code] = i
+            self._rows.setdefault(name, i)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, country):
+        return country in self._rows
+
+    def row(self, country):
+        return self._rows[country]
+
+    def get(self, country, default=None):
+        return self._rows.get(country, default)
+
+    def rows(self, country_list):
+        return np.fromiter((self._rows[country] for country in country_list), dtype=np.intp)
+
+    def names_of(self, country_list):
+        return list(self.names[self.rows(country_list)])
+
+
+def build(path=ISO3_CODES_FILE):
+    import pycountry
+
+    codes = sorted(country.alpha_3 for country in pycountry.countries)
+    with open(path, "w") as f:
+        f.write("\n".join(codes) + "\n")
+    return codes
+
+
+if __name__ == "__main__":
+    print("{} codes written to {}".format(len(build()), ISO3_CODES_FILE))
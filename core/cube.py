@@ -0,0 +1,111 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import countries
+from . import data_cache
+
+# Dense (country, indicator, year) cube over several World Bank indicator files.
+#
+# Every source file has the same layout (Country Name, Country Code, Indicator
+# Name, Indicator Code, 1960 ... 2021), so they stack into one float64 array.
+# Selecting one country and a year window is a plain slice of that array, i.e. a
+# view with no copy; only non-contiguous indicator lists need a gather.
+
+
+class IndicatorCube:
+    def __init__(self, frames):
+        first = next(iter(frames.values()))
+        self.country_names = first["Country Name"].to_numpy()
+        self.country_codes = first["Country Code"].to_numpy()
+        self.indicators = list(frames)
+        self.years = [column for column in first.columns if column.isdigit()]
+
+        self.countries = countries.CountryIndex(self.country_names, self.country_codes)
+        self.indicator_index = {key: i for i, key in enumerate(self.indicators)}
+        self.year_index = {year: i for i, year in enumerate(self.years)}
+
+        self.values = np.full((len(self.country_codes), len(self.indicators), len(self.years)), np.nan)
+        for i, df in enumerate(frames.values()):
+            # Files normally share the same country order, but align on the code
+            # rather than trusting row positions.
+            rows = df["Country Code"].map(self.countries.get)
+            known = rows.notna().to_numpy()
+            columns = [self.year_index[year] for year in df.columns if year in self.year_index]
+            self.values[rows[known].astype("int64").to_numpy()[:, None], i, columns] = \
+                df.loc[known, [self.years[c] for c in columns]].to_numpy(dtype="float64")
+
+    def country_row(self, country):
+        return self.countries.row(country)
+
+    def _year_slice(self, start, end):
+        return slice(self.year_index[str(start)], self.year_index[str(end)] + 1)
+
+    def _indicator_selection(self, indicators):
+        if indicators is None:
+            return slice(None)
+        positions = [self.indicator_index[key] for key in indicators]
+        if positions == list(range(positions[0], positions[-1] + 1)):
+            return slice(positions[0], positions[-1] + 1)
+        return positions
+
+    def window_years(self, start, end):
+        return self.years[self._year_slice(start, end)]
+
+    def window(self, country, start, end, indicators=None):
+        # (indicator, year) block for one country; a view unless the indicator
+        # list is non-contiguous.
+        return self.values[self.country_row(country), self._indicator_selection(indicators), self._year_slice(start, end)]
+
+    def series(self, country, indicator, start, end):
+        return self.values[self.country_row(country), self.indicator_index[indicator], self._year_slice(start, end)]
+
+    def gather(self, country_list, start, end, indicators=None):
+        # (country, indicator, year) block for several countries in one
+        # fancy-indexed gather (a copy, unlike window()).
+        rows = self.countries.rows(country_list)
+        return self.values[rows][:, self._indicator_selection(indicators), self._year_slice(start, end)]
+
+    def long_frame(self, country_list, start, end, indicators=None):
+        # Tidy (year, country, variable, value) frame for charting several countries.
+        if indicators is None:
+            indicators = self.indicators
+        block = self.gather(country_list, start, end, indicators)
+        years = self.window_years(start, end)
+        names = self.countries.names_of(country_list)
+        return pd.DataFrame({
+            "year": np.tile(years, len(names) * len(indicators)),
+            "country": np.repeat(names, len(indicators) * len(years)),
+            "variable": np.tile(np.repeat(indicators, len(years)), len(names)),
+            "value": block.reshape(-1),
+        })
+
+    def frame(self, country, start, end, indicators=None):
+        if indicators is None:
+            indicators = self.indicators
+        df = pd.DataFrame(self.window(country, start, end, indicators).T, columns=indicators, copy=False)
+        df.insert(0, "year", self.window_years(start, end))
+        return df
+
+
+_lock = threading.Lock()
+_cubes = {}
+
+
+def load(sources):
+    # sources: ((indicator key, csv path), ...)
+    sources = tuple(sources)
+    key = tuple((name, os.path.normpath(path)) for name, path in sources)
+    versions = tuple(data_cache.version(path) for _, path in sources)
+
+    with _lock:
+        cached = _cubes.get(key)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+    indicator_cube = IndicatorCube({name: data_cache.load(path) for name, path in sources})
+    with _lock:
+        _cubes[key] = (versions, indicator_cube)
+    return indicator_cube
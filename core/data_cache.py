@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+from types import MappingProxyType
+
+from . import data_store
+
+# Process-wide cache of the data_source/ frames.
+#
+# Streamlit re-executes the dashboard scripts on every interaction, but imported
+# modules live for the whole server process, so every session shares the frames
+# held here. Frames returned by `load` are shared: treat them as read-only and
+# copy (or use non-mutating methods such as astype/rename) before changing them.
+#
+# An entry is revalidated with a cheap stat() on every access. When mtime or size
+# change the file content is hashed, and the frame is only re-read if the hash
+# differs from the cached one.
+#
+# When reloader.py runs, it publishes immutable Snapshots of data_source/ instead
+# and files in the snapshot are served from it without touching the disk. A rerun
+# calls pin() first so every load() in it sees the same snapshot, even if a newer
+# one is published halfway through.
+
+_lock = threading.Lock()
+_entries = {}
+_stats = {"hits": 0, "misses": 0, "revalidations": 0}
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Snapshot:
+    def __init__(self, entries, loaded_at):
+        self.entries = MappingProxyType(dict(entries))
+        self.loaded_at = loaded_at
+        digest = hashlib.sha1()
+        for key in sorted(self.entries):
+            digest.update("{}={}\n".format(key, self.entries[key]["version"]).encode())
+        self.version = digest.hexdigest()[:12]
+
+
+_published = None
+_local = threading.local()
+
+
+class FileChanged(Exception):
+    pass
+
+
+def read_entry(path):
+    # Reads a file for a snapshot; raises FileChanged if it was modified while
+    # being read (e.g. a CSV still being copied into data_source/).
+    key = os.path.normpath(path)
+    signature = _file_signature(key)
+    entry = {"frame": data_store.read_csv(key), "signature": signature, "version": _file_hash(key)}
+    if _file_signature(key) != signature:
+        raise FileChanged(key)
+    return entry
+
+
+def publish(snapshot):
+    global _published
+    _published = snapshot
+
+
+def pin(snapshot=None):
+    _local.snapshot = snapshot if snapshot is not None else _published
+    return _local.snapshot
+
+
+def unpin():
+    _local.snapshot = None
+
+
+def snapshot():
+    pinned = getattr(_local, "snapshot", None)
+    return pinned if pinned is not None else _published
+
+
+def _entry(path):
+    key = os.path.normpath(path)
+    current = snapshot()
+    if current is not None:
+        entry = current.entries.get(key)
+        if entry is not None:
+            _stats["hits"] += 1
+            return entry
+
+    signature = _file_signature(key)
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry["signature"] == signature:
+            _stats["hits"] += 1
+            return entry
+
+        content_hash = _file_hash(key)
+        if entry is not None and entry["version"] == content_hash:
+            entry["signature"] = signature
+            _stats["revalidations"] += 1
+            return entry
+
+        entry = {
+            "frame": data_store.read_csv(key),
+            "signature": signature,
+            "version": content_hash,
+        }
+        _entries[key] = entry
+        _stats["misses"] += 1
+        return entry
+
+
+def load(path):
+    return _entry(path)["frame"]
+
+
+def version(path):
+    return _entry(path)["version"]
+
+
+def stats():
+    with _lock:
+        return dict(_stats, entries=len(_entries))
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        for key in _stats:
+            _stats[key] = 0
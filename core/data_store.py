@@ -0,0 +1,344 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+# Compiled, memory-mappable copy of every CSV under data_source/.
+#
+# Layout of the store:
+#   data_store/index.json                 -> metadata index (one entry per source CSV)
+#   data_store/<table>/<dtype>.npy        -> one 2D block per numeric dtype, stored
+#                                            column-major (one contiguous row per column)
+#   data_store/<table>/str_<i>.npy        -> one fixed-width unicode array per text column
+#
+# `read_csv` is a drop-in for pd.read_csv(path): it memory-maps the compiled
+# blocks when the store is fresh and falls back to parsing the CSV otherwise.
+#
+# `python -m core.data_store refresh` compiles the files, validates every table and
+# publishes the result atomically: each build goes to its own
+# data_store.v<timestamp>/ directory and `data_store` is a symlink swapped in a
+# single rename, so readers see either the old store or the new one, never a mix.
+# A source that fails to compile or validate is left out of the store (read_csv
+# parses its CSV instead) and reported; the other tables are still published.
+# `build` compiles in one process.
+#
+# refresh uses a process pool only with more than one CPU and at least
+# POOL_MIN_BYTES of CSV: each worker pays ~100 ms to start and import pandas,
+# which is more than compiling all of data_source/ takes (about 130 ms serially;
+# a 2-worker pool measured 0.64x of that). --serial-baseline reports the actual
+# ratio.
+
+SOURCE_DIR = "data_source"
+STORE_DIR = "data_store"
+INDEX_FILE = "index.json"
+STORE_FORMAT = 2
+POOL_MIN_BYTES = 32 * 1024 * 1024
+# Record-level tables (one row per import line, see hs_imports.py) have no label
+# column to check for uniqueness.
+UNKEYED_PREFIXES = (SOURCE_DIR + "/detail_import/",)
+
+
+def _source_key(path):
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def _table_name(key):
+    return os.path.splitext(key)[0].replace("/", "__")
+
+
+def list_sources(source_dir=SOURCE_DIR):
+    sources = []
+    for root, dirs, files in os.walk(source_dir):
+        # staging directories of wdi_ingest and hs_imports hold half-written files
+        dirs[:] = [name for name in dirs if not name.endswith(".tmp")]
+        for name in files:
+            if name.endswith(".csv"):
+                sources.append(_source_key(os.path.join(root, name)))
+    return sorted(sources)
+
+
+def _write_table(df, table_dir):
+    os.makedirs(table_dir, exist_ok=True)
+    columns = []
+    blocks = {}
+    for position, column in enumerate(df.columns):
+        values = df[column]
+        if values.dtype == object:
+            text = values.to_numpy()
+            nulls = [int(i) for i in np.flatnonzero(pd.isna(text))]
+            text = np.where(pd.isna(text), "", text).astype(str)
+            file_name = "str_{}.npy".format(position)
+            np.save(os.path.join(table_dir, file_name), text)
+            columns.append({"name": column, "kind": "str", "file": file_name, "nulls": nulls})
+        else:
+            dtype = values.dtype.str.lstrip("<>=|")
+            blocks.setdefault(dtype, []).append(values.to_numpy())
+            columns.append({"name": column, "kind": "num", "block": dtype, "offset": len(blocks[dtype]) - 1})
+
+    for dtype, arrays in blocks.items():
+        np.save(os.path.join(table_dir, "{}.npy".format(dtype)), np.stack(arrays))
+
+    return columns
+
+
+def _validate(key, df, entry, store_dir):
+    errors = []
+    if df.empty:
+        errors.append("no rows")
+    errors += ["year column {} is not numeric".format(column)
+               for column in df.columns if str(column).isdigit() and df[column].dtype == object]
+
+    # World Bank indicator files are keyed by country code, the BPS tables by
+    # the label in their first column.
+    label = "Country Code" if "Country Code" in df.columns else df.columns[0]
+    if not key.startswith(UNKEYED_PREFIXES):
+        if df[label].isna().any():
+            errors.append("missing values in {}".format(label))
+        if df[label].duplicated().any():
+            errors.append("duplicate values in {}".format(label))
+
+    if not errors and not _read_table(entry, store_dir).equals(df):
+        mixed = [column for column in df.columns
+                 if df[column].dtype == object and df[column].dropna().map(type).nunique() > 1]
+        errors.append("compiled table does not read back identically{}".format(
+            " (mixed types in {})".format(", ".join(map(str, mixed))) if mixed else ""))
+    if errors:
+        raise ValueError("; ".join(errors))
+
+
+def _compile(key, staging_dir):
+    # One source CSV -> one table directory. Runs in a worker process for refresh.
+    started = time.perf_counter()
+    source = os.stat(key)
+    df = pd.read_csv(key)
+    parsed = time.perf_counter()
+
+    table = _table_name(key)
+    entry = {
+        "table": table,
+        "rows": len(df),
+        "source_mtime_ns": source.st_mtime_ns,
+        "source_size": source.st_size,
+        "columns": _write_table(df, os.path.join(staging_dir, table)),
+    }
+    written = time.perf_counter()
+
+    _validate(key, df, entry, staging_dir)
+    validated = time.perf_counter()
+    return entry, {
+        "parse_ms": (parsed - started) * 1000,
+        "write_ms": (written - parsed) * 1000,
+        "validate_ms": (validated - written) * 1000,
+        "total_ms": (validated - started) * 1000,
+    }
+
+
+def _publish(version_dir, store_dir):
+    link = store_dir + ".link"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(version_dir), link)
+    if os.path.isdir(store_dir) and not os.path.islink(store_dir):
+        # store written before builds were versioned
+        shutil.rmtree(store_dir)
+    os.replace(link, store_dir)
+
+
+def _prune(store_dir, keep=2):
+    # The previous version stays around for readers that resolved the symlink
+    # just before the swap.
+    parent = os.path.dirname(os.path.abspath(store_dir))
+    prefix = os.path.basename(store_dir) + ".v"
+    versions = sorted(name for name in os.listdir(parent) if name.startswith(prefix))
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+
+
+def build(source_dir=SOURCE_DIR, store_dir=STORE_DIR, workers=1, verbose=True):
+    staging_dir = store_dir + ".tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    # largest files first, so a long parse is not the last thing left in the pool
+    sizes = {key: os.path.getsize(key) for key in list_sources(source_dir)}
+    keys = sorted(sizes, key=lambda key: -sizes[key])
+    workers = min(workers, os.cpu_count() or 1, len(keys) or 1)
+    if sum(sizes.values()) < POOL_MIN_BYTES:
+        workers = 1
+    results = []
+    # source -> why it was left out; any exception, so one bad file names itself
+    # instead of aborting the build
+    skipped = {}
+    started = time.perf_counter()
+
+    if workers == 1:
+        for key in keys:
+            try:
+                results.append((key, _compile(key, staging_dir)))
+            except Exception as error:
+                skipped[key] = "{}: {}".format(type(error).__name__, error)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_compile, key, staging_dir): key for key in keys}
+            for future in as_completed(futures):
+                try:
+                    results.append((futures[future], future.result()))
+                except Exception as error:
+                    skipped[futures[future]] = "{}: {}".format(type(error).__name__, error)
+
+    for key in skipped:
+        shutil.rmtree(os.path.join(staging_dir, _table_name(key)), ignore_errors=True)
+
+    index = {"format": STORE_FORMAT, "tables": {}}
+    timings = {}
+    for key, (entry, timing) in sorted(results):
+        index["tables"][key] = entry
+        timings[key] = timing
+        if verbose:
+            print("{:<45} {:>6} rows  parse {:>7.1f} ms  write {:>6.1f} ms  validate {:>6.1f} ms".format(
+                key, entry["rows"], timing["parse_ms"], timing["write_ms"], timing["validate_ms"]))
+
+    with open(os.path.join(staging_dir, INDEX_FILE), "w") as f:
+        json.dump(index, f, indent=1)
+
+    version_dir = "{}.v{}".format(store_dir, time.time_ns())
+    os.replace(staging_dir, version_dir)
+    _publish(version_dir, store_dir)
+    _prune(store_dir)
+
+    wall_ms = (time.perf_counter() - started) * 1000
+    file_ms = sum(timing["total_ms"] for timing in timings.values())
+    if verbose:
+        for key, error in sorted(skipped.items()):
+            print("{:<45} skipped, read from CSV: {}".format(key, error))
+        print("{} files, {} rows in {:.1f} ms with {} worker(s); per-file work {:.1f} ms".format(
+            len(index["tables"]), sum(entry["rows"] for entry in index["tables"].values()),
+            wall_ms, workers, file_ms))
+    return {"index": index, "timings": timings, "wall_ms": wall_ms, "file_ms": file_ms, "workers": workers, "skipped": skipped}
+
+
+_index_cache = {}
+
+
+def _load_index(store_dir=STORE_DIR):
+    # -> (resolved store directory, index). The symlink is resolved once per read
+    # so a refresh published halfway through cannot mix two versions.
+    root = os.path.realpath(store_dir)
+    index_path = os.path.join(root, INDEX_FILE)
+    try:
+        mtime_ns = os.stat(index_path).st_mtime_ns
+    except FileNotFoundError:
+        return root, None
+
+    cached = _index_cache.get(root)
+    if cached is None or cached[0] != mtime_ns:
+        with open(index_path) as f:
+            index = json.load(f)
+        cached = (mtime_ns, index if index.get("format") == STORE_FORMAT else None)
+        _index_cache[root] = cached
+    return root, cached[1]
+
+
+def _fresh_entry(path, store_dir=STORE_DIR):
+    root, index = _load_index(store_dir)
+    if index is None:
+        return root, None
+    entry = index["tables"].get(_source_key(path))
+    if entry is None:
+        return root, None
+    # a source that is gone, newer than its compiled table or of a different size
+    # is stale
+    try:
+        source = os.stat(path)
+    except FileNotFoundError:
+        return root, None
+    fresh = source.st_mtime_ns <= entry["source_mtime_ns"] and source.st_size == entry["source_size"]
+    return root, entry if fresh else None
+
+
+def is_fresh(path, store_dir=STORE_DIR):
+    return _fresh_entry(path, store_dir)[1] is not None
+
+
+def _read_table(entry, store_dir, columns=None):
+    table_dir = os.path.join(store_dir, entry["table"])
+    wanted = entry["columns"] if columns is None else [c for c in entry["columns"] if c["name"] in columns]
+
+    blocks = {}
+    df = None
+    for column in wanted:
+        if column["kind"] != "num" or column["block"] in blocks:
+            continue
+        blocks[column["block"]] = np.load(os.path.join(table_dir, "{}.npy".format(column["block"])), mmap_mode="r")
+
+    # The largest numeric block becomes the frame's base block without copying,
+    # every other column is inserted at its original position.
+    if blocks:
+        base = max(blocks, key=lambda dtype: blocks[dtype].shape[0])
+        base_columns = [c for c in wanted if c["kind"] == "num" and c["block"] == base]
+        base_offsets = [c["offset"] for c in base_columns]
+        base_values = blocks[base] if base_offsets == list(range(blocks[base].shape[0])) else blocks[base][base_offsets]
+        df = pd.DataFrame(base_values.T, columns=[c["name"] for c in base_columns], copy=False)
+    else:
+        base = None
+        df = pd.DataFrame(index=pd.RangeIndex(entry["rows"]))
+
+    for position, column in enumerate(wanted):
+        if column["kind"] == "num":
+            if column["block"] == base:
+                continue
+            values = blocks[column["block"]][column["offset"]]
+        else:
+            values = np.load(os.path.join(table_dir, column["file"])).astype(object)
+            if column["nulls"]:
+                values[column["nulls"]] = np.nan
+        df.insert(position, column["name"], values)
+
+    return df
+
+
+def read_csv(path, columns=None, store_dir=STORE_DIR):
+    root, entry = _fresh_entry(path, store_dir)
+    if entry is not None:
+        return _read_table(entry, root, columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile data_source/ CSVs into a memory-mappable store.")
+    parser.add_argument("command", choices=["build", "refresh", "status"])
+    parser.add_argument("--source-dir", default=SOURCE_DIR)
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="processes used by refresh")
+    parser.add_argument("--serial-baseline", action="store_true",
+                        help="also time a serial build into a scratch directory and report the speedup")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        for key in list_sources(args.source_dir):
+            print("{:<45} {}".format(key, "fresh" if is_fresh(key, args.store_dir) else "stale"))
+        return
+
+    workers = 1 if args.command == "build" else args.workers
+    result = build(args.source_dir, args.store_dir, workers)
+    if args.serial_baseline:
+        scratch_dir = tempfile.mkdtemp()
+        try:
+            serial = build(args.source_dir, os.path.join(scratch_dir, STORE_DIR), 1, verbose=False)
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+        print("serial build {:.1f} ms, {} worker(s) {:.1f} ms: {:.2f}x".format(
+            serial["wall_ms"], result["workers"], result["wall_ms"], serial["wall_ms"] / result["wall_ms"]))
+    if result["skipped"]:
+        sys.exit("published without {} source(s): {}".format(len(result["skipped"]), ", ".join(sorted(result["skipped"]))))
+
+
+if __name__ == "__main__":
+    main()
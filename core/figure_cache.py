@@ -0,0 +1,91 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from . import spans
+
+# Rasterized matplotlib/seaborn figures, keyed by a hash of the plotted data, the
+# plotting function and its style arguments.
+#
+# A figure is drawn and saved once per key, closed straight away, and the PNG/SVG
+# bytes are kept in a bounded LRU so reruns only hand bytes to st.image.
+
+MAX_ENTRIES = 32
+
+_lock = threading.Lock()
+_images = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _data_digest(digest, data):
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        digest.update(repr(list(data.columns) if isinstance(data, pd.DataFrame) else data.name).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    else:
+        data = np.ascontiguousarray(data)
+        digest.update(repr((data.dtype.str, data.shape)).encode())
+        digest.update(data.tobytes())
+
+
+def figure_key(plot, data, fmt, style):
+    digest = hashlib.sha1()
+    digest.update("{}.{}:{}".format(plot.__module__, plot.__qualname__, fmt).encode())
+    digest.update(repr(sorted(style.items())).encode())
+    _data_digest(digest, data)
+    return digest.hexdigest()
+
+
+def render(plot, data, fmt="png", **style):
+    # plot(data, ax=ax, **style) draws onto a fresh figure; returns image bytes
+    key = figure_key(plot, data, fmt, style)
+
+    with _lock:
+        image = _images.get(key)
+        if image is not None:
+            _images.move_to_end(key)
+            _stats["hits"] += 1
+            return image
+
+    # matplotlib is only needed on a cache miss, so it is not imported at start-up
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    try:
+        plot(data, ax=ax, **style)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    image = buffer.getvalue()
+
+    with _lock:
+        _images[key] = image
+        _stats["misses"] += 1
+        while len(_images) > MAX_ENTRIES:
+            _images.popitem(last=False)
+            _stats["evictions"] += 1
+    return image
+
+
+def stats():
+    with _lock:
+        return dict(_stats, entries=len(_images), bytes=sum(len(image) for image in _images.values()))
+
+
+def report():
+    # shown with the profiling panel (?profile=1)
+    import streamlit as st
+
+    if not spans.active():
+        return
+    current = stats()
+    with st.sidebar.expander("Gambar: {} hit, {} miss".format(current["hits"], current["misses"])):
+        st.dataframe([{
+            "gambar": "{}/{}".format(current["entries"], MAX_ENTRIES),
+            "KB": round(current["bytes"] / 1024),
+            "dikeluarkan": current["evictions"],
+        }])
@@ -0,0 +1,146 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import data_cache
+
+# Trend and forecast fits for every row of a BPS table at once.
+#
+# The BPS tables (label column, then one column per year) are read into a
+# (series, year) matrix and every model is fitted to all rows together:
+#   linear     least-squares y = a + b*t, from per-row sums (missing years masked)
+#   loglinear  the same on log(y), i.e. constant growth rate; rows with values <= 0
+#              get no fit
+#   ses        simple exponential smoothing, alpha picked per row from a grid by
+#              one-step-ahead squared error, all alphas and rows in one pass
+# Each model yields point forecasts for the next HORIZON years and a prediction
+# band (Z standard errors). Fits are cached per dataset version by load().
+
+HORIZON = 4
+Z = 1.96
+METHODS = ("linear", "loglinear", "ses")
+SES_ALPHAS = np.linspace(0.05, 1.0, 20)
+
+
+def _linear(t, y):
+    # t: (T,), y: (n, T) -> coefficients, residual std and the sums needed for
+    # the prediction band
+    w = ~np.isnan(y)
+    y0 = np.where(w, y, 0.0)
+    s0 = w.sum(axis=1)
+    st = (w * t).sum(axis=1)
+    stt = (w * t * t).sum(axis=1)
+    sy = y0.sum(axis=1)
+    sty = (y0 * t).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_mean = st / s0
+        sxx = stt - s0 * t_mean ** 2
+        slope = (sty - st * sy / s0) / sxx
+        intercept = sy / s0 - slope * t_mean
+        residuals = np.where(w, y - (intercept[:, None] + slope[:, None] * t), 0.0)
+        sigma = np.sqrt((residuals ** 2).sum(axis=1) / (s0 - 2))
+    return intercept, slope, sigma, s0, t_mean, sxx
+
+
+def _trend_forecast(t, y, future):
+    intercept, slope, sigma, s0, t_mean, sxx = _linear(t, y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        point = intercept[:, None] + slope[:, None] * future
+        spread = Z * sigma[:, None] * np.sqrt(1 + 1 / s0[:, None] + (future - t_mean[:, None]) ** 2 / sxx[:, None])
+    return point, point - spread, point + spread
+
+
+def _ses_forecast(y, steps):
+    # levels for every (alpha, series) pair, iterating over the T years only
+    n, T = y.shape
+    alphas = SES_ALPHAS[:, None]
+    level = np.broadcast_to(y[:, 0], (len(SES_ALPHAS), n)).copy()
+    sse = np.zeros((len(SES_ALPHAS), n))
+    for i in range(1, T):
+        observed = y[:, i]
+        error = np.where(np.isnan(observed), 0.0, observed - level)
+        sse += error ** 2
+        level = level + alphas * error
+
+    best = np.argmin(sse, axis=0)
+    columns = np.arange(n)
+    alpha = SES_ALPHAS[best]
+    sigma = np.sqrt(sse[best, columns] / max(T - 1, 1))
+    point = np.repeat(level[best, columns][:, None], steps, axis=1)
+    h = np.arange(1, steps + 1)
+    spread = Z * sigma[:, None] * np.sqrt(1 + (h - 1) * alpha[:, None] ** 2)
+    return point, point - spread, point + spread, alpha
+
+
+class Forecast:
+    def __init__(self, df, method="linear", horizon=HORIZON):
+        if method not in METHODS:
+            raise ValueError("method must be one of {}".format(METHODS))
+
+        label = df.columns[0]
+        years = sorted(column for column in df.columns[1:] if str(column).isdigit())
+        self.method = method
+        self.labels = df[label].to_numpy()
+        self.label_index = {value: i for i, value in enumerate(self.labels)}
+        self.years = [str(year) for year in years]
+        self.future_years = [str(int(self.years[-1]) + h) for h in range(1, horizon + 1)]
+
+        y = df[years].to_numpy(dtype="float64")
+        t = np.array([int(year) for year in years], dtype="float64")
+        future = np.array([int(year) for year in self.future_years], dtype="float64")
+        self.alpha = None
+
+        if method == "linear":
+            self.point, self.lower, self.upper = _trend_forecast(t, y, future)
+        elif method == "loglinear":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                log_y = np.where(y > 0, np.log(y), np.nan)
+            point, lower, upper = _trend_forecast(t, log_y, future)
+            # rows with a non-positive value have no log-linear fit
+            invalid = (y <= 0).any(axis=1)
+            point[invalid] = lower[invalid] = upper[invalid] = np.nan
+            self.point, self.lower, self.upper = np.exp(point), np.exp(lower), np.exp(upper)
+        else:
+            self.point, self.lower, self.upper, self.alpha = _ses_forecast(y, horizon)
+
+    def frame(self, label):
+        i = self.label_index[label]
+        return pd.DataFrame({
+            "year": self.future_years,
+            "value": self.point[i],
+            "lower": self.lower[i],
+            "upper": self.upper[i],
+        })
+
+    def long_frame(self, labels):
+        rows = np.fromiter((self.label_index[label] for label in labels), dtype=np.intp)
+        steps = len(self.future_years)
+        return pd.DataFrame({
+            "year": np.tile(self.future_years, len(rows)),
+            "label": np.repeat(self.labels[rows], steps),
+            "value": self.point[rows].reshape(-1),
+            "lower": self.lower[rows].reshape(-1),
+            "upper": self.upper[rows].reshape(-1),
+        })
+
+
+_lock = threading.Lock()
+_fits = {}
+
+
+def load(path, method="linear"):
+    key = (os.path.normpath(path), method)
+    version = data_cache.version(path)
+
+    with _lock:
+        cached = _fits.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    fit = Forecast(data_cache.load(path), method)
+    with _lock:
+        _fits[key] = (version, fit)
+    return fit
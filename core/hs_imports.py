@@ -0,0 +1,266 @@
+import argparse
+import csv
+import hashlib
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from . import data_cache
+from . import data_store
+from . import topk
+
+# Monthly import values at HS-code level, partitioned by year and month range.
+#
+# Layout:
+#   data_source/detail_import/partitions.csv             -> one row per partition
+#   data_source/detail_import/year=2021/months=01-12.csv -> hs_code, nama_data, value
+#
+# A partition holds the rows of one year for months first..last (BPS monthly
+# releases are one month each; older annual summaries cover 01-12). value is in
+# million US$. The partition files are ordinary CSVs, so `python -m core.data_store
+# build` compiles them and query() reads only the requested columns of the
+# partitions that fall inside the requested period through data_store.read_csv.
+# The index is the only file data_cache, the reloader and export.py look at: it
+# carries a digest of every partition, so its version changes with any of them.
+#
+#   python -m core.hs_imports ingest impor_bulanan_hs.csv      # BPS monthly export
+#   python -m core.hs_imports seed                             # DETAIL_IMPORT_LATEST.csv
+#   python -m core.hs_imports status
+
+STORE_DIR = os.path.join("data_source", "detail_import")
+INDEX_FILE = "partitions.csv"
+LEGACY_FILE = os.path.join("data_source", "DETAIL_IMPORT_LATEST.csv")
+# the periods the hand-picked file was cut for
+LEGACY_MONTHS = {2021: (1, 12), 2022: (1, 1)}
+
+COLUMNS = ["hs_code", "nama_data", "value"]
+# column names of the BPS "Impor menurut kode HS" monthly download
+SOURCE_COLUMNS = {"Tahun": "year", "Bulan": "month", "Kode HS": "hs_code", "Uraian": "nama_data", "Nilai CIF (US$)": "value"}
+CHUNK_ROWS = 200000
+
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agu", "Sep", "Okt", "Nov", "Des")
+PARTITION_PATTERN = re.compile(r"year=(\d{4})[/\\]months=(\d{2})-(\d{2})\.csv$")
+
+
+def index_path(store_dir=STORE_DIR):
+    return os.path.join(store_dir, INDEX_FILE)
+
+
+def partition_path(year, first, last, store_dir=STORE_DIR):
+    return os.path.join(store_dir, "year={}".format(year), "months={:02d}-{:02d}.csv".format(first, last))
+
+
+def is_partition(path):
+    return PARTITION_PATTERN.search(os.path.normpath(path)) is not None
+
+
+def _digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def _row_count(path):
+    # records, not lines: a quoted Uraian may span several lines
+    with open(path, newline="") as f:
+        return sum(1 for _ in csv.reader(f)) - 1
+
+
+def write_index(store_dir=STORE_DIR, exclude=()):
+    # exclude: partitions about to be deleted
+    exclude = {os.path.normpath(path) for path in exclude}
+    rows = []
+    for key in data_store.list_sources(store_dir):
+        match = PARTITION_PATTERN.search(key)
+        if match is None or os.path.normpath(key) in exclude:
+            continue
+        year, first, last = (int(group) for group in match.groups())
+        rows.append({
+            "year": year,
+            "first_month": first,
+            "last_month": last,
+            "file": os.path.relpath(key, store_dir).replace(os.sep, "/"),
+            "rows": _row_count(key),
+            "digest": _digest(key),
+        })
+    index = pd.DataFrame(rows, columns=["year", "first_month", "last_month", "file", "rows", "digest"])
+    index = index.sort_values(["year", "first_month"]).reset_index(drop=True)
+
+    # written after new partitions are in place and before old ones are deleted,
+    # and swapped in, so readers never see an index that points at a partition
+    # which is not there
+    staging = index_path(store_dir) + ".tmp"
+    index.to_csv(staging, index=False)
+    os.replace(staging, index_path(store_dir))
+    return index
+
+
+def partitions(store_dir=STORE_DIR):
+    return data_cache.load(index_path(store_dir))
+
+
+def version(store_dir=STORE_DIR):
+    return data_cache.version(index_path(store_dir))
+
+
+def period_label(year, first, last):
+    if first == last:
+        return "{} ({})".format(MONTHS[first - 1], year)
+    return "{} - {} ({})".format(MONTHS[first - 1], MONTHS[last - 1], year)
+
+
+def periods(store_dir=STORE_DIR):
+    # label -> (year, first month, last month): one year-to-date period per year,
+    # up to the last month covered without gaps from January
+    result = {}
+    for year, rows in partitions(store_dir).groupby("year", sort=True):
+        covered = 0
+        for first, last in zip(rows["first_month"], rows["last_month"]):
+            if first != covered + 1:
+                break
+            covered = last
+        if covered:
+            result[period_label(int(year), 1, covered)] = (int(year), 1, covered)
+    return result
+
+
+def query(year, first=1, last=12, columns=None, store_dir=STORE_DIR):
+    # rows of every partition inside year/first..last; only `columns` are read
+    index = partitions(store_dir)
+    selected = index[(index["year"] == year) & (index["first_month"] >= first) & (index["last_month"] <= last)]
+    columns = COLUMNS if columns is None else list(columns)
+    frames = [data_store.read_csv(os.path.join(store_dir, file), columns=columns) for file in selected["file"]]
+    if not frames:
+        return pd.DataFrame({column: [] for column in columns})
+    return pd.concat(frames, ignore_index=True)
+
+
+_lock = threading.Lock()
+_totals = {}
+
+
+def totals(year, first=1, last=12, store_dir=STORE_DIR):
+    # value per nama_data over the period, as a LabeledTopK; cached per index version
+    key = (os.path.normpath(store_dir), year, first, last)
+    current = version(store_dir)
+    with _lock:
+        cached = _totals.get(key)
+        if cached is not None and cached[0] == current:
+            return cached[1]
+
+    rows = query(year, first, last, ["nama_data", "value"], store_dir)
+    summed = rows.groupby("nama_data", sort=False, as_index=False)["value"].sum()
+    table = topk.LabeledTopK(summed, "nama_data")
+    with _lock:
+        _totals[key] = (current, table)
+    return table
+
+
+def top(year, first=1, last=12, k=20, store_dir=STORE_DIR):
+    return totals(year, first, last, store_dir).top("value", k)
+
+
+def _replace_years(staging_dir, store_dir):
+    # Each staged partition replaces its live file atomically; the live files of
+    # those years that the new data does not have are dropped from the index
+    # first and deleted after, so the current index stays readable throughout.
+    stale = []
+    for year_dir in sorted(os.listdir(staging_dir)):
+        source, target = os.path.join(staging_dir, year_dir), os.path.join(store_dir, year_dir)
+        staged = sorted(os.listdir(source))
+        os.makedirs(target, exist_ok=True)
+        for name in staged:
+            os.replace(os.path.join(source, name), os.path.join(target, name))
+        stale += [os.path.join(target, name) for name in os.listdir(target) if name not in staged]
+    index = write_index(store_dir, exclude=stale)
+    for path in stale:
+        os.remove(path)
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    return index
+
+
+def ingest(source_path, store_dir=STORE_DIR, chunk_rows=CHUNK_ROWS, progress=True):
+    # Streams a BPS monthly HS export into one partition per (year, month). Years
+    # present in the file replace the stored ones; other years are kept.
+    staging_dir = store_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    written = set()
+    rows_read = 0
+    started = time.perf_counter()
+    reader = pd.read_csv(
+        source_path,
+        usecols=list(SOURCE_COLUMNS),
+        dtype={"Kode HS": str, "Uraian": str},
+        chunksize=chunk_rows,
+    )
+    for chunk in reader:
+        chunk = chunk.rename(columns=SOURCE_COLUMNS)
+        chunk["value"] = chunk["value"] / 1e6
+        rows_read += len(chunk)
+        for (year, month), rows in chunk.groupby(["year", "month"], sort=False):
+            path = partition_path(int(year), int(month), int(month), staging_dir)
+            first = path not in written
+            if first:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            rows.loc[:, COLUMNS].to_csv(path, mode="w" if first else "a", header=first, index=False)
+            written.add(path)
+        if progress:
+            print("\r{:>10,} rows  {:>4} partitions  {:>9,.0f} rows/s".format(
+                rows_read, len(written), rows_read / (time.perf_counter() - started)), end="", file=sys.stderr)
+    if progress:
+        print(file=sys.stderr)
+
+    os.makedirs(store_dir, exist_ok=True)
+    _replace_years(staging_dir, store_dir)
+    return {"rows": rows_read, "partitions": len(written), "seconds": time.perf_counter() - started}
+
+
+def seed(legacy_path=LEGACY_FILE, store_dir=STORE_DIR):
+    # The hand-picked DETAIL_IMPORT_LATEST.csv as partitions (no HS codes).
+    staging_dir = store_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    df = pd.read_csv(legacy_path)
+    for year, rows in df.groupby("tahun"):
+        first, last = LEGACY_MONTHS.get(int(year), (1, 12))
+        path = partition_path(int(year), first, last, staging_dir)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        rows.assign(hs_code="").loc[:, COLUMNS].to_csv(path, index=False)
+
+    os.makedirs(store_dir, exist_ok=True)
+    return _replace_years(staging_dir, store_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partitioned monthly HS-level import store.")
+    parser.add_argument("command", choices=["ingest", "seed", "status"])
+    parser.add_argument("source", nargs="?", help="BPS monthly HS export (ingest) or legacy file (seed)")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        if not args.source:
+            parser.error("ingest needs the BPS export to read")
+        stats = ingest(args.source, args.store_dir, args.chunk_rows)
+        print("{rows:,} rows into {partitions} partitions in {seconds:.1f} s".format(**stats))
+    elif args.command == "seed":
+        seed(args.source or LEGACY_FILE, args.store_dir)
+
+    index = pd.read_csv(index_path(args.store_dir))
+    for row in index.itertuples():
+        print("{:<24} {:>10,} rows  {}  {}".format(row.file, row.rows, row.digest,
+                                                   "compiled" if data_store.is_fresh(os.path.join(args.store_dir, row.file)) else "csv"))
+    print("periods: {}".format(", ".join(periods(args.store_dir))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import argparse
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from . import data_cache
+from . import spans
+
+# Memoized pipelines: load -> filter -> merge -> correlate -> chart as a graph of
+# named nodes with explicit inputs.
+#
+#   trend = Pipeline("sector_trend")
+#   trend.source("pdb", PDB_FILE)
+#   trend.node("pdb_row", _sector_row, df_pdb=ref("pdb"), usaha=param("usaha"))
+#   trend.node("pdb_line", charts.build_line_chart, df=ref("pdb_row"))
+#   trend.run(["pdb_line"], usaha="C. Industri Pengolahan")
+#
+# A node calls an existing function with keyword arguments that are other nodes
+# (ref), run parameters (param) or constants. Its key is a content hash: the
+# function's name, the parameter and constant values, and the keys of the nodes
+# it reads. Source nodes are keyed by data_cache.version of their file, and a
+# node that reads files through the caches itself (correlation.load,
+# forecast.load, ...) lists them in reads=, so every key changes exactly when
+# the data under it does. Values are kept in one LRU shared by all pipelines and
+# sessions, so they are shared and must be treated as read-only.
+#
+# Every run records, per thread (so per session), which nodes were cache hits,
+# including targets the caller served from spec_cache (run(..., served=...));
+# dump() prints the last one as text and to_dot() as a Graphviz graph, shown in
+# the profiling panel of the pages.
+#
+#   python -m core.pipeline --sector "C. Industri Pengolahan"
+
+MAX_ENTRIES = 512
+
+_lock = threading.Lock()
+_values = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_pipelines = OrderedDict()
+_local = threading.local()
+
+
+class ref:
+    def __init__(self, name):
+        self.name = name
+
+
+class param:
+    def __init__(self, name):
+        self.name = name
+
+
+class Node:
+    def __init__(self, name, func, arguments, reads, memo):
+        self.name = name
+        self.func = func
+        self.arguments = arguments
+        self.reads = tuple(reads)
+        self.memo = memo
+
+    def inputs(self):
+        return [value.name for value in self.arguments.values() if isinstance(value, ref)]
+
+
+def _source(path):
+    return data_cache.load(path)
+
+
+def _lookup(key):
+    with _lock:
+        if key in _values:
+            _values.move_to_end(key)
+            _stats["hits"] += 1
+            return True, _values[key]
+        _stats["misses"] += 1
+    return False, None
+
+
+def _store(key, value):
+    with _lock:
+        _values[key] = value
+        _values.move_to_end(key)
+        while len(_values) > MAX_ENTRIES:
+            _values.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+# trace status -> node colour; nodes of a graph the run did not need stay grey
+_COLORS = {"hit": "#C8E6C9", "spec": "#BBDEFB", "MISS": "#FFCDD2", "run": "#FFF9C4"}
+
+
+def _status(entry):
+    if entry["cache"] == "spec":
+        return "spec"
+    if entry["cache"] is None:
+        return "run"
+    return "hit" if entry["hit"] else "MISS"
+
+
+class Pipeline:
+    def __init__(self, name):
+        self.name = name
+        self.nodes = OrderedDict()
+        _pipelines[name] = self
+
+    @property
+    def last_trace(self):
+        return getattr(_local, "traces", {}).get(self.name, [])
+
+    def node(self, name, func, reads=(), memo=True, **arguments):
+        # memo=False for nodes whose result is cached elsewhere (charts, which
+        # views keep serialized in spec_cache); they run whenever they are needed
+        for value in arguments.values():
+            if isinstance(value, ref) and value.name not in self.nodes:
+                raise ValueError("{}: unknown input node {}".format(name, value.name))
+        self.nodes[name] = Node(name, func, arguments, reads, memo)
+        return self
+
+    def source(self, name, path):
+        return self.node(name, _source, reads=(path,), path=path)
+
+    def _key(self, node, keys, params):
+        digest = hashlib.sha1()
+        digest.update("{}/{}:{}.{}".format(self.name, node.name, node.func.__module__, node.func.__qualname__).encode())
+        for argument, value in sorted(node.arguments.items()):
+            if isinstance(value, ref):
+                token = "ref:" + keys[value.name]
+            elif isinstance(value, param):
+                token = "param:" + repr(params[value.name])
+            else:
+                token = "const:" + repr(value)
+            digest.update("{}={};".format(argument, token).encode())
+        for path in node.reads:
+            digest.update(data_cache.version(path).encode())
+        return digest.hexdigest()
+
+    def run(self, targets, served=(), **params):
+        # -> {target: value}; evaluates only the nodes the targets depend on.
+        # served names nodes the caller already had from an outer cache; they are
+        # recorded in the trace as hits of that cache and not evaluated.
+        keys = {}
+        values = {}
+        trace = [
+            {"node": name, "key": "-", "cache": "spec", "hit": True, "ms": 0.0, "inputs": self.nodes[name].inputs()}
+            for name in served
+        ]
+
+        def evaluate(name):
+            if name in values:
+                return values[name]
+            node = self.nodes[name]
+            for upstream in node.inputs():
+                evaluate(upstream)
+            key = keys[name] = self._key(node, keys, params)
+
+            started = time.perf_counter()
+            hit, value = _lookup(key) if node.memo else (False, None)
+            if not hit:
+                kwargs = {
+                    argument: values[value.name] if isinstance(value, ref) else params[value.name] if isinstance(value, param) else value
+                    for argument, value in node.arguments.items()
+                }
+                value = node.func(**kwargs)
+                if node.memo:
+                    _store(key, value)
+            trace.append({
+                "node": name, "key": key[:10], "cache": "pipeline" if node.memo else None, "hit": hit,
+                "ms": (time.perf_counter() - started) * 1000, "inputs": node.inputs(),
+            })
+            values[name] = value
+            return value
+
+        result = {target: evaluate(target) for target in targets}
+        if not hasattr(_local, "traces"):
+            _local.traces = {}
+        _local.traces[self.name] = trace
+        return result
+
+    def dump(self, trace=None):
+        trace = self.last_trace if trace is None else trace
+        lines = ["{} ({} nodes, {} hits)".format(self.name, len(trace), sum(entry["hit"] for entry in trace))]
+        for entry in trace:
+            lines.append("  {:<4} {:<18} {:>9.2f} ms  {:<10}  <- {}".format(
+                _status(entry), entry["node"], entry["ms"], entry["key"], ", ".join(entry["inputs"]) or "-"))
+        return "\n".join(lines)
+
+    def to_dot(self, trace=None):
+        trace = self.last_trace if trace is None else trace
+        lines = ["digraph {} {{".format(self.name), "  rankdir=LR;", "  node [shape=box, style=filled, fontsize=10];"]
+        for entry in trace:
+            lines.append('  "{}" [label="{}\\n{} {:.1f} ms", fillcolor="{}"];'.format(
+                entry["node"], entry["node"], _status(entry), entry["ms"], _COLORS[_status(entry)]))
+            for upstream in entry["inputs"]:
+                lines.append('  "{}" -> "{}";'.format(upstream, entry["node"]))
+        lines.append("}")
+        return "\n".join(lines)
+
+
+def pipelines():
+    return list(_pipelines.values())
+
+
+def stats():
+    with _lock:
+        return dict(_stats, entries=len(_values))
+
+
+def clear():
+    with _lock:
+        _values.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+
+def report():
+    # shown with the profiling panel (?profile=1)
+    import streamlit as st
+
+    if not spans.active():
+        return
+    with st.sidebar.expander("Pipeline: {hits} hit, {misses} miss, {entries} nilai".format(**stats())):
+        for pipeline in pipelines():
+            if pipeline.last_trace:
+                st.caption(pipeline.dump().splitlines()[0])
+                st.graphviz_chart(pipeline.to_dot())
+
+
+def main():
+    from . import views
+
+    parser = argparse.ArgumentParser(description="Render the sector trend view cold, warm and with another method and print which nodes were cached.")
+    parser.add_argument("--sector", default=None, help="lapangan_usaha (default: the first one)")
+    parser.add_argument("--method", default="linear")
+    parser.add_argument("--dot", action="store_true", help="print Graphviz DOT instead of text")
+    args = parser.parse_args()
+
+    sector = args.sector or views.sector_options()[0]
+    other = next(method for method, _ in views.FORECAST_METHODS if method != args.method)
+    # warm: both charts come from spec_cache and no node runs; another method:
+    # spec_cache misses and the pipeline memo supplies the frames shared with
+    # the first method
+    runs = (("cold", args.method), ("warm", args.method), ("method " + other, other))
+    for label, method in runs:
+        views.sector_trend(sector, method)
+        print("# {} run".format(label))
+        print(views.SECTOR_TREND.to_dot() if args.dot else views.SECTOR_TREND.dump())
+    # under -m this file is __main__; the cache views used is core.pipeline's
+    print("pipeline", views.pipeline.stats())
+    print("spec_cache", views.spec_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
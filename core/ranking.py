@@ -0,0 +1,78 @@
+import os
+import threading
+
+import pandas as pd
+
+from . import countries
+from . import data_cache
+from . import topk
+
+# Per-year country ranking for any World Bank indicator file
+# (Country Name, Country Code, Indicator Name, Indicator Code, 1960 ... 2021).
+#
+# Built once per dataset version on top of topk.TopK: top-N of a year is a
+# partial selection cached per (year, N), and a country's rank is read from an
+# inverse permutation cached per year, so each lookup is O(1) after one sort of
+# that year. Missing values rank last, ties keep file order.
+
+
+class RankingIndex:
+    def __init__(self, df, codes=None):
+        if codes is not None:
+            df = df[df["Country Code"].isin(codes)]
+
+        self.names = df["Country Name"].to_numpy()
+        self.codes = df["Country Code"].to_numpy()
+        self.years = [column for column in df.columns if column.isdigit()]
+        self.year_index = {year: i for i, year in enumerate(self.years)}
+        self.countries = countries.CountryIndex(self.names, self.codes)
+
+        self.values = df[self.years].to_numpy(dtype="float64")
+        self.table = topk.TopK(self.values, self.years)
+
+    def top(self, year, n):
+        rows = self.table.rows(year, n)
+        return pd.DataFrame({
+            "Country Name": self.names[rows],
+            "Country Code": self.codes[rows],
+            year: self.values[rows, self.year_index[year]],
+        })
+
+    # `country` is a name or an ISO-3 code; the *_of_many variants take a list and
+    # gather all rows in one indexing operation.
+    def value(self, country, year):
+        return self.values[self.countries.row(country), self.year_index[year]]
+
+    def rank_of(self, country, year):
+        return self.table.rank(self.countries.row(country), year)
+
+    def rank_delta(self, country, year, previous_year=None):
+        if previous_year is None:
+            previous_year = str(int(year) - 1)
+        return self.rank_of(country, previous_year) - self.rank_of(country, year)
+
+    def values_of_many(self, country_list, year):
+        return self.values[self.countries.rows(country_list), self.year_index[year]]
+
+    def ranks_of_many(self, country_list, year):
+        return self.table.ranks(self.countries.rows(country_list), year)
+
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def load(path, codes=None):
+    codes_key = None if codes is None else frozenset(codes)
+    key = (os.path.normpath(path), codes_key)
+    version = data_cache.version(path)
+
+    with _lock:
+        cached = _indexes.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    index = RankingIndex(data_cache.load(path), codes_key)
+    with _lock:
+        _indexes[key] = (version, index)
+    return index
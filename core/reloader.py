@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from . import data_cache
+from . import data_store
+from . import hs_imports
+
+# Background hot-reload of data_source/.
+#
+# start() loads the CSVs the views read (sources=, e.g. views.SOURCES; every CSV
+# under source_dir when not given) into a data_cache.Snapshot, runs the warm-up
+# callback with that snapshot pinned (so rankings, the correlation engine and the sector
+# cube are built for it) and publishes it. A daemon thread then polls the files'
+# mtime/size; once a change has been stable for one poll interval, the changed
+# files are re-read, derived structures are rebuilt on the watcher thread and the
+# new snapshot replaces the old one in a single assignment. Reruns that pinned
+# the old snapshot finish on it; the next rerun picks up the new one.
+#
+# Other files under data_source/ (the data_source/wdi/ extracts, for instance)
+# are not in the snapshot and are not watched; data_cache reads them from disk if
+# something loads them. If a rebuild fails, it is retried only once the files
+# change again.
+
+POLL_SECONDS = 2.0
+
+_lock = threading.Lock()
+_thread = None
+_status = {"reloads": 0, "last_reload_ms": None, "last_error": None, "errors": 0}
+
+
+def _signatures(source_dir, sources=None):
+    signatures = {}
+    for key in data_store.list_sources(source_dir) if sources is None else sources:
+        # partitions are read column by column through the store, only their
+        # index is part of a snapshot
+        if hs_imports.is_partition(key):
+            continue
+        try:
+            stat = os.stat(key)
+        except FileNotFoundError:
+            continue
+        signatures[os.path.normpath(key)] = (stat.st_mtime_ns, stat.st_size)
+    return signatures
+
+
+def _snapshot_signatures(snapshot):
+    return {key: entry["signature"] for key, entry in snapshot.entries.items()}
+
+
+def _is_year(column):
+    return str(column).isdigit()
+
+
+def _check(key, old, entry):
+    # A truncated file (a copy that stalled for longer than a poll) usually shows
+    # up as an empty frame, a lost year column or a year column read as text;
+    # keep the old snapshot until the file looks complete. Copying to a temporary
+    # name and renaming avoids this altogether. New year columns are how new
+    # figures are published, so they are accepted.
+    frame = entry["frame"]
+    if frame.empty:
+        raise ValueError("{} has no rows".format(key))
+    for column in frame.columns:
+        if _is_year(column) and not pd.api.types.is_numeric_dtype(frame[column]):
+            raise ValueError("{} column {} is not numeric".format(key, column))
+    if old is None:
+        return
+    columns, old_columns = list(frame.columns), list(old["frame"].columns)
+    if columns[:1] != old_columns[:1]:
+        raise ValueError("{} label column changed from {} to {}".format(key, old_columns[0], columns[0]))
+    if [c for c in columns if not _is_year(c)] != [c for c in old_columns if not _is_year(c)]:
+        raise ValueError("{} columns changed".format(key))
+    missing = [c for c in old_columns if _is_year(c) and c not in frame.columns]
+    if missing:
+        raise ValueError("{} lost year columns {}".format(key, ", ".join(missing)))
+
+
+def build(source_dir=data_store.SOURCE_DIR, previous=None, warm=None, sources=None):
+    started = time.perf_counter()
+    entries = {}
+    for key, signature in _signatures(source_dir, sources).items():
+        old = previous.entries.get(key) if previous is not None else None
+        if old is not None and old["signature"] == signature:
+            entries[key] = old
+            continue
+        entry = data_cache.read_entry(key)
+        _check(key, old, entry)
+        if old is not None and old["version"] == entry["version"]:
+            # touched but not changed: keep the frame derived structures were built on
+            entry = dict(old, signature=entry["signature"])
+        entries[key] = entry
+
+    snapshot = data_cache.Snapshot(entries, time.time())
+    if warm is not None:
+        data_cache.pin(snapshot)
+        try:
+            warm()
+        finally:
+            data_cache.unpin()
+    data_cache.publish(snapshot)
+
+    with _lock:
+        _status["reloads"] += 1
+        _status["last_reload_ms"] = (time.perf_counter() - started) * 1000
+        _status["last_error"] = None
+    return snapshot
+
+
+def _watch(source_dir, warm, interval, sources):
+    seen = None
+    failed = None
+    while True:
+        time.sleep(interval)
+        try:
+            signatures = _signatures(source_dir, sources)
+            current = data_cache.snapshot()
+            if current is not None and signatures == _snapshot_signatures(current):
+                seen = None
+                continue
+            # wait until the files stop changing, so a copy in progress is not read
+            if signatures != seen:
+                seen = signatures
+                continue
+            # the last rebuild of exactly these files failed; wait for another change
+            if signatures == failed:
+                continue
+            build(source_dir, current, warm, sources)
+            seen = failed = None
+        except Exception as error:
+            # anything, including a failing warm(), leaves the old snapshot
+            # published; the thread keeps polling and the error shows in status()
+            with _lock:
+                _status["last_error"] = "{}: {}".format(type(error).__name__, error)
+                _status["errors"] += 1
+            failed = seen
+            seen = None
+
+
+def start(warm=None, source_dir=data_store.SOURCE_DIR, interval=POLL_SECONDS, sources=None):
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.current_thread()
+
+    try:
+        build(source_dir, None, warm, sources)
+    except Exception:
+        with _lock:
+            _thread = None
+        raise
+    thread = threading.Thread(target=_watch, args=(source_dir, warm, interval, sources), name="data-reloader", daemon=True)
+    thread.start()
+    with _lock:
+        _thread = thread
+
+
+def status():
+    snapshot = data_cache.snapshot()
+    with _lock:
+        result = dict(_status)
+    if snapshot is not None:
+        result.update(version=snapshot.version, loaded_at=snapshot.loaded_at, files=len(snapshot.entries))
+    return result
+
+
+def caption(snapshot):
+    if snapshot is None:
+        return "Versi data: langsung dari data_source/"
+    return "Versi data {} · dimuat {}".format(snapshot.version, time.strftime("%d %b %Y %H:%M:%S", time.localtime(snapshot.loaded_at)))
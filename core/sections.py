@@ -0,0 +1,134 @@
+import functools
+
+import streamlit as st
+
+from . import data_cache
+from . import spans
+
+# Page regions as rerunnable units with declared widget dependencies.
+#
+#   @sections.section("body3: Impor Summarize", depends_on=("impor_year",))
+#   def impor_section(section):
+#       year = st.selectbox("Tahun Impor", views.YEARS, key="impor_year")
+#       impor_view = section.compute(views.impor_summary, year)
+#       ...
+#   impor_section()
+#
+# depends_on lists the session_state keys of the widgets the section reads. Where
+# Streamlit has fragments (st.fragment, or st.experimental_fragment before 1.37)
+# each section is one, so changing one of its widgets reruns only that section.
+# Without them the whole script reruns, but a section whose dependencies and data
+# snapshot are unchanged takes its section.compute() results from the previous
+# run instead of recomputing them; only the element calls are replayed.
+#
+# Every run records which sections executed and which recomputed; report() shows
+# them per interaction next to the profiling panel.
+
+FRAGMENT = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+HISTORY_SIZE = 20
+
+_STATE_KEY = "_sections"
+
+
+def _state():
+    if _STATE_KEY not in st.session_state:
+        st.session_state[_STATE_KEY] = {"cache": {}, "history": [], "current": None}
+    return st.session_state[_STATE_KEY]
+
+
+def _data_version():
+    current = data_cache.snapshot()
+    return current.version if current is not None else None
+
+
+def _signature(depends_on):
+    return (_data_version(),) + tuple(repr(st.session_state.get(key)) for key in depends_on)
+
+
+class Section:
+    def __init__(self, name, entry, fresh):
+        self.name = name
+        self.entry = entry
+        self.fresh = fresh
+        self.recomputed = False
+
+    def compute(self, func, *args, **kwargs):
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        results = self.entry["results"]
+        if self.fresh and key in results:
+            return results[key]
+        self.recomputed = True
+        results[key] = func(*args, **kwargs)
+        return results[key]
+
+
+def begin_rerun():
+    state = _state()
+    state["current"] = {"full": True, "executed": [], "recomputed": []}
+
+
+def end_rerun():
+    state = _state()
+    if state["current"] is not None:
+        state["history"] = (state["history"] + [state["current"]])[-HISTORY_SIZE:]
+        state["current"] = None
+
+
+def _record(name, recomputed):
+    state = _state()
+    run = state["current"]
+    if run is None:
+        # a fragment rerun: this section is the whole interaction
+        run = {"full": False, "executed": [], "recomputed": []}
+        state["history"] = (state["history"] + [run])[-HISTORY_SIZE:]
+    run["executed"].append(name)
+    if recomputed:
+        run["recomputed"].append(name)
+
+
+def section(name, depends_on=()):
+    depends_on = tuple(depends_on)
+
+    def decorate(render):
+        @functools.wraps(render)
+        def run():
+            state = _state()
+            entry = state["cache"].get(name)
+            fresh = entry is not None and entry["signature"] == _signature(depends_on)
+            if not fresh:
+                entry = {"signature": None, "results": {}}
+                state["cache"][name] = entry
+
+            current = Section(name, entry, fresh)
+            with spans.span(name):
+                render(current)
+            # taken after the widgets exist, so the first run's defaults count
+            entry["signature"] = _signature(depends_on)
+            _record(name, current.recomputed)
+
+        return FRAGMENT(run) if FRAGMENT is not None else run
+
+    return decorate
+
+
+def history():
+    return list(_state()["history"])
+
+
+def report():
+    # shown with the profiling panel (?profile=1)
+    runs = history()
+    if not runs or not spans.active():
+        return
+    last = runs[-1]
+    with st.sidebar.expander("Bagian dihitung ulang: {}/{}".format(len(last["recomputed"]), len(last["executed"]))):
+        st.caption("fragment" if FRAGMENT is not None else "rerun penuh, hasil bagian yang tidak berubah dipakai ulang")
+        st.dataframe([
+            {
+                "interaksi": i + 1,
+                "dijalankan": len(run["executed"]),
+                "dihitung ulang": len(run["recomputed"]),
+                "bagian": ", ".join(run["recomputed"]),
+            }
+            for i, run in enumerate(runs)
+        ])
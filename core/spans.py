@@ -0,0 +1,221 @@
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from collections import deque
+
+# Lightweight timing spans for the dashboard scripts.
+#
+# A rerun is bracketed by begin_rerun()/end_rerun(); inside it each `# region`
+# block calls begin(name)/end() and helpers are wrapped with @timed. Spans record
+# their duration and, where it can be inferred, the number of rows processed.
+# Finished reruns are kept per script so the debug panel can show percentiles.
+#
+# Profiling is off unless DASHBOARD_PROFILE=1 is set or the page is opened with
+# ?profile=1. When off every call is a single thread-local lookup.
+#
+# All pages of the app share one process, so each rerun also records the process
+# RSS before and after it; pages() compares latency and memory across pages
+# (benchmarks/pages.py does the same against one process per page).
+
+ENABLED = os.environ.get("DASHBOARD_PROFILE") == "1"
+HISTORY_SIZE = 100
+
+_local = threading.local()
+_lock = threading.Lock()
+_history = {}
+
+
+def rss_mb():
+    # current resident set size; falls back to the peak where /proc is missing
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _profile_requested():
+    try:
+        import streamlit as st
+
+        if hasattr(st, "query_params"):
+            return st.query_params.get("profile") == "1"
+        return st.experimental_get_query_params().get("profile") == ["1"]
+    except Exception:
+        return False
+
+
+def _trace():
+    return getattr(_local, "trace", None)
+
+
+def begin_rerun(script):
+    if not (ENABLED or _profile_requested()):
+        _local.trace = None
+        return
+    _local.trace = {"script": script, "started": time.perf_counter(), "wall_time": time.time(), "rss_mb": rss_mb(), "spans": [], "stack": []}
+
+
+def active():
+    return _trace() is not None
+
+
+def begin(name, rows=None):
+    trace = _trace()
+    if trace is None:
+        return
+    span = {
+        "name": name,
+        "parent": trace["stack"][-1]["name"] if trace["stack"] else None,
+        "start_ms": (time.perf_counter() - trace["started"]) * 1000,
+        "rows": rows,
+    }
+    trace["stack"].append(span)
+
+
+def end(rows=None):
+    trace = _trace()
+    if trace is None or not trace["stack"]:
+        return
+    _close(trace, rows)
+
+
+def _close(trace, rows=None):
+    span = trace["stack"].pop()
+    span["duration_ms"] = (time.perf_counter() - trace["started"]) * 1000 - span["start_ms"]
+    if rows is not None:
+        span["rows"] = rows
+    trace["spans"].append(span)
+
+
+class span:
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        begin(self.name, self.rows)
+        return self
+
+    def __exit__(self, *exc):
+        end()
+        return False
+
+
+def _row_count(value):
+    if hasattr(value, "shape") and len(getattr(value, "shape")) > 0:
+        return int(value.shape[0])
+    return None
+
+
+def timed(func):
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _trace() is None:
+            return func(*args, **kwargs)
+        begin(name)
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            rows = _row_count(result)
+            if rows is None and args:
+                rows = _row_count(args[0])
+            end(rows)
+
+    return wrapper
+
+
+def end_rerun():
+    trace = _trace()
+    _local.trace = None
+    if trace is None:
+        return
+
+    while trace["stack"]:
+        _close(trace)
+
+    record = {
+        "script": trace["script"],
+        "wall_time": trace["wall_time"],
+        "total_ms": (time.perf_counter() - trace["started"]) * 1000,
+        "rss_mb": rss_mb(),
+        "rss_delta_mb": 0.0,
+        "spans": sorted(trace["spans"], key=lambda s: s["start_ms"]),
+    }
+    record["rss_delta_mb"] = record["rss_mb"] - trace["rss_mb"]
+    with _lock:
+        _history.setdefault(trace["script"], deque(maxlen=HISTORY_SIZE)).append(record)
+    _render_panel(trace["script"], record)
+
+
+def history(script=None):
+    with _lock:
+        if script is not None:
+            return list(_history.get(script, ()))
+        return {name: list(records) for name, records in _history.items()}
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def summary(script):
+    durations = {}
+    for record in history(script):
+        for s in record["spans"]:
+            durations.setdefault((s["parent"], s["name"]), []).append(s)
+
+    rows = []
+    for (parent, name), spans in durations.items():
+        values = [s["duration_ms"] for s in spans]
+        rows.append({
+            "span": name if parent is None else "  {} / {}".format(parent, name),
+            "calls": len(values),
+            "last_ms": round(values[-1], 2),
+            "p50_ms": round(_percentile(values, 0.5), 2),
+            "p95_ms": round(_percentile(values, 0.95), 2),
+            "rows": spans[-1]["rows"],
+        })
+    return rows
+
+
+def pages():
+    # one row per script (page) that has recorded reruns
+    rows = []
+    for script, records in sorted(history().items()):
+        totals = [record["total_ms"] for record in records]
+        rows.append({
+            "page": script,
+            "reruns": len(records),
+            "first_ms": round(totals[0], 1),
+            "p50_ms": round(_percentile(totals, 0.5), 1),
+            "p95_ms": round(_percentile(totals, 0.95), 1),
+            "rss_growth_mb": round(sum(record["rss_delta_mb"] for record in records), 1),
+            "rss_mb": round(records[-1]["rss_mb"], 1),
+        })
+    return rows
+
+
+def export_json(script=None):
+    return json.dumps(history(script), indent=1)
+
+
+def _render_panel(script, record):
+    import streamlit as st
+
+    with st.sidebar.expander("Profiling: {:.1f} ms this rerun".format(record["total_ms"])):
+        st.caption("{} reruns recorded for {}".format(len(history(script)), script))
+        st.dataframe(summary(script))
+        st.caption("Semua halaman (satu proses, {:.0f} MB RSS)".format(record["rss_mb"]))
+        st.dataframe(pages())
+        st.download_button("Export traces (JSON)", export_json(script), file_name="traces.json", mime="application/json")
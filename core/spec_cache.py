@@ -0,0 +1,133 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+
+import altair as alt
+
+from . import data_cache
+from . import spans
+
+# Serialized Vega-Lite specs of the dashboard charts, keyed by
+# (chart builder, parameters, dataset version).
+#
+#   chart = spec_cache.get("g20", (year, compared), (GDP_FILE,),
+#                          lambda: charts.makeG20Chart(gdp_top20(year), compared))
+#
+# On a miss build() makes the Altair chart and it is serialized once, the way
+# st.altair_chart would (no default theme, datasets inlined, no row limit); the
+# JSON text is kept in an LRU bounded by MAX_BYTES. A hit skips building the
+# chart, validating it against the schema and serializing it: the view returns
+# a Spec, which charts.altair_chart hands to st.vega_lite_chart and export.py
+# reads with to_dict() like an Altair chart. The dataset version is
+# data_cache.version of every file the chart is drawn from, so a data reload
+# changes every key that depends on it.
+#
+# stats() reports the hit rate and the bytes that did not have to be
+# re-serialized; report() shows them in the profiling panel.
+
+MAX_BYTES = 32 * 1024 * 1024
+
+_lock = threading.Lock()
+_specs = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0, "bytes_saved": 0, "build_ms": 0.0}
+
+
+class Spec:
+    def __init__(self, name, text, build_ms):
+        self.name = name
+        self.text = text
+        self.size = len(text.encode())
+        self.build_ms = build_ms
+
+    def to_dict(self):
+        return json.loads(self.text)
+
+
+def serialize(chart):
+    # as st.altair_chart does: Altair's default theme sizes the view, Streamlit's does not
+    with alt.themes.enable("none") if alt.themes.active == "default" else nullcontext():
+        with alt.data_transformers.enable("default", max_rows=None):
+            return json.dumps(chart.to_dict(), separators=(",", ":"))
+
+
+def spec_key(name, params, paths):
+    return (name, repr(params), tuple(data_cache.version(path) for path in paths))
+
+
+def lookup(name, params, paths):
+    # -> the cached Spec, or None
+    key = spec_key(name, params, paths)
+    with _lock:
+        spec = _specs.get(key)
+        if spec is None:
+            _stats["misses"] += 1
+            return None
+        _specs.move_to_end(key)
+        _stats["hits"] += 1
+        _stats["bytes_saved"] += spec.size
+        _stats["build_ms"] += spec.build_ms
+        return spec
+
+
+def store(name, params, paths, chart, build_ms=0.0):
+    # serializes an Altair chart built elsewhere; build_ms is what building it
+    # took, so hits can report the time saved
+    key = spec_key(name, params, paths)
+    with spans.span("spec_cache: {}".format(name)):
+        started = time.perf_counter()
+        spec = Spec(name, serialize(chart), build_ms)
+        spec.build_ms += (time.perf_counter() - started) * 1000
+
+    with _lock:
+        previous = _specs.pop(key, None)
+        if previous is not None:
+            _stats["bytes"] -= previous.size
+        _specs[key] = spec
+        _stats["bytes"] += spec.size
+        while _stats["bytes"] > MAX_BYTES and len(_specs) > 1:
+            _, evicted = _specs.popitem(last=False)
+            _stats["bytes"] -= evicted.size
+            _stats["evictions"] += 1
+    return spec
+
+
+def get(name, params, paths, build):
+    spec = lookup(name, params, paths)
+    if spec is not None:
+        return spec
+    started = time.perf_counter()
+    chart = build()
+    return store(name, params, paths, chart, (time.perf_counter() - started) * 1000)
+
+
+def stats():
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return dict(_stats, entries=len(_specs), hit_rate=_stats["hits"] / lookups if lookups else 0.0)
+
+
+def clear():
+    with _lock:
+        _specs.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+
+def report():
+    # shown with the profiling panel (?profile=1)
+    import streamlit as st
+
+    if not spans.active():
+        return
+    current = stats()
+    with st.sidebar.expander("Spec chart: {:.0%} hit".format(current["hit_rate"])):
+        st.dataframe([{
+            "hit": current["hits"],
+            "miss": current["misses"],
+            "spec": current["entries"],
+            "KB di cache": round(current["bytes"] / 1024),
+            "KB tidak diserialisasi ulang": round(current["bytes_saved"] / 1024),
+            "ms dihemat": round(current["build_ms"]),
+        }])
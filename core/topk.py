@@ -0,0 +1,130 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from . import data_cache
+
+# Top-K rows of a table by partial selection.
+#
+# A TopK holds the numeric columns of a table as one float64 array. rows() picks
+# the K best rows of a column with np.argpartition (O(n)) and only sorts those K,
+# so a top-3 of 17 sectors or a top-20 of ~250 countries never sorts the whole
+# column. Missing values always come last and ties are broken by row order, also
+# at the K-th place: every row tied with the partition's K-th key is a candidate.
+# Results are kept in an LRU of MAX_ROWS (column, K, direction) entries on the
+# TopK, which itself is cached per dataset version by load(). rank()/ranks() read an inverse
+# permutation built by one full sort per (column, direction), the first time a
+# rank of that column is asked for.
+
+MAX_ROWS = 64
+
+
+class TopK:
+    def __init__(self, values, columns):
+        self.values = np.asarray(values, dtype="float64")
+        self.columns = [str(column) for column in columns]
+        self.column_index = {column: i for i, column in enumerate(self.columns)}
+        self._rows = OrderedDict()
+        self._ranks = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        if columns is None:
+            columns = [column for column in df.columns if pd.api.types.is_numeric_dtype(df[column])]
+        return cls(df[columns].to_numpy(dtype="float64"), columns)
+
+    def _sort_key(self, column, largest):
+        values = self.values[:, self.column_index[str(column)]]
+        return np.where(np.isnan(values), np.inf, -values if largest else values)
+
+    def rows(self, column, k, largest=True):
+        k = max(0, min(k, len(self.values)))
+        key = (str(column), k, largest)
+        with self._lock:
+            cached = self._rows.get(key)
+            if cached is not None:
+                self._rows.move_to_end(key)
+                return cached
+
+        sort_key = self._sort_key(column, largest)
+        if 0 < k < len(sort_key):
+            kth = sort_key[np.argpartition(sort_key, k - 1)[k - 1]]
+            candidates = np.flatnonzero(sort_key <= kth)
+        else:
+            candidates = np.arange(len(sort_key))
+        rows = candidates[np.lexsort((candidates, sort_key[candidates]))][:k]
+        rows.setflags(write=False)
+
+        with self._lock:
+            self._rows[key] = rows
+            while len(self._rows) > MAX_ROWS:
+                self._rows.popitem(last=False)
+        return rows
+
+    def _inverse(self, column, largest):
+        # row -> 0-based position in a full sort (ties by row order)
+        key = (str(column), largest)
+        with self._lock:
+            cached = self._ranks.get(key)
+        if cached is not None:
+            return cached
+
+        sort_key = self._sort_key(column, largest)
+        order = np.lexsort((np.arange(len(sort_key)), sort_key))
+        inverse = np.empty(len(order), dtype=np.intp)
+        inverse[order] = np.arange(len(order))
+        inverse.setflags(write=False)
+
+        with self._lock:
+            self._ranks[key] = inverse
+        return inverse
+
+    def rank(self, row, column, largest=True):
+        return int(self._inverse(column, largest)[row])
+
+    def ranks(self, rows, column, largest=True):
+        return self._inverse(column, largest)[np.asarray(rows, dtype=np.intp)]
+
+
+class LabeledTopK(TopK):
+    # TopK over a table with a label column (lapangan_usaha, golongan_sitc, ...).
+
+    def __init__(self, df, label):
+        columns = [column for column in df.columns if column != label and pd.api.types.is_numeric_dtype(df[column])]
+        super().__init__(df[columns].to_numpy(dtype="float64"), columns)
+        self.label = label
+        self.labels = df[label].to_numpy()
+
+    def top(self, column, k, largest=True):
+        rows = self.rows(column, k, largest)
+        return pd.DataFrame({
+            self.label: self.labels[rows],
+            str(column): self.values[rows, self.column_index[str(column)]],
+        })
+
+
+_lock = threading.Lock()
+_tables = {}
+
+
+def load(path, label):
+    key = (os.path.normpath(path), label)
+    version = data_cache.version(path)
+
+    with _lock:
+        cached = _tables.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    table = LabeledTopK(data_cache.load(path), label)
+    with _lock:
+        _tables[key] = (version, table)
+    return table
+
+
+def top(path, label, column, k=3, largest=True):
+    return load(path, label).top(column, k, largest)
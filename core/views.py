@@ -0,0 +1,420 @@
+import time
+
+import pandas as pd
+from numerize import numerize
+
+from . import charts
+from . import correlation
+from . import countries
+from . import cube
+from . import data_cache
+from . import figure_cache
+from . import forecast
+from . import hs_imports
+from . import pipeline
+from . import ranking
+from . import spans
+from . import spec_cache
+from . import topk
+from . import windowed
+
+# View models for every widget-driven section of main.py and the pages in pages/.
+#
+# A view takes the widget values of one section and returns a dict with the
+# section's Altair charts ("charts": name -> chart), PNG figures ("images":
+# name -> bytes), metric tiles ("metrics": [(label, value, delta)]) and text lines
+# ("lines"). The scripts render these with Streamlit and export.py serializes
+# them for every widget state, so both always show the same numbers.
+#
+# VIEWS at the bottom lists every view with its widget states and the files it
+# reads; export.py hashes those files to decide which states need re-rendering.
+
+GDP_FILE = "data_source/gdp_dollar.csv"
+PDB_FILE = "data_source/pdb_lapangan_usaha.csv"
+IMPOR_FILE = "data_source/impor_ton.csv"
+DETAIL_IMPORT_INDEX = hs_imports.index_path()
+FORECAST_METHODS = (
+    ("linear", "Tren linear"),
+    ("loglinear", "Tren log-linear (pertumbuhan tetap)"),
+    ("ses", "Exponential smoothing"),
+)
+SECTOR_FILES = (
+    ("agri_value", "data_source/AGRI_GDP_VALUE.csv"),
+    ("gdp_value", "data_source/GDP_GROWTH.csv"),
+    ("industry_value", "data_source/INDUSTRY_VALUE.csv"),
+    ("import_goods_value", "data_source/IMPORT_GOOD_VALUE.csv"),
+)
+# every file the views read; reloader.py snapshots and watches only these
+SOURCES = (GDP_FILE, PDB_FILE, IMPOR_FILE) + tuple(path for _, path in SECTOR_FILES) + (DETAIL_IMPORT_INDEX,)
+
+# widget options
+YEARS = ('2021', '2020', '2019', "2018", "2017", "2016", "2015", "2014", "2013", "2012", "2011", "2010")
+TOP20_YEARS = ("2017", "2018", "2019", "2020", "2021")
+SLIDER_YEARS = tuple(str(year) for year in range(2001, 2022))
+
+SECTOR_DTYPES = {
+    'agri_value': 'int32',
+    'gdp_value': 'int32',
+    'import_goods_value': 'int32',
+    'industry_value': 'int32',
+}
+
+
+def _view(charts=None, images=None, metrics=None, lines=None):
+    return {"charts": charts or {}, "images": images or {}, "metrics": metrics or [], "lines": lines or []}
+
+
+def _top_lines(path, label, year, k=3):
+    df_top = topk.top(path, label, year, k)
+    return ["({}) {} ({})".format(i + 1, name, numerize.numerize(int(value)))
+            for i, (name, value) in enumerate(zip(df_top[label], df_top[year]))]
+
+
+def _as_int64(path):
+    df = data_cache.load(path).copy()
+    for column in df.columns[1:]:
+        df[column] = df[column].astype('int64')
+    return df
+
+
+# region pages/2_Laju_PDB_dan_Impor.py
+
+def gdp_ranking():
+    return ranking.load(GDP_FILE, countries.iso3_codes())
+
+
+def gdp_top20(year):
+    df_gdp_top20 = gdp_ranking().top(year, 20).loc[:, ["Country Name", year]]
+    df_gdp_top20.rename(columns = {year: "US$"}, inplace=True)
+    return df_gdp_top20
+
+
+@spans.timed
+def g20(year, compared=()):
+    gdp = gdp_ranking()
+    previous_year = str(int(year) - 1)
+    value, value_previous = int(gdp.value("IDN", year)), int(gdp.value("IDN", previous_year))
+    rank, rank_previous = gdp.rank_of("IDN", year), gdp.rank_of("IDN", previous_year)
+    metrics = [
+        ("Nilai PDB Indonesia", numerize.numerize(value), numerize.numerize(value - value_previous)),
+        ("Posisi Indonesia G20", "{}/20".format(rank + 1), str(rank_previous - rank)),
+    ]
+
+    compared = list(compared)
+    if compared:
+        values = gdp.values_of_many(compared, year)
+        ranks = gdp.ranks_of_many(compared, year)
+        ranks_previous = gdp.ranks_of_many(compared, previous_year)
+        for name, value, rank, rank_previous in zip(compared, values, ranks, ranks_previous):
+            metrics.append(("PDB {}".format(name), numerize.numerize(int(value)), "{} posisi".format(rank_previous - rank)))
+
+    chart = spec_cache.get("g20", (year, compared), (GDP_FILE,),
+                           lambda: charts.makeG20Chart(gdp_top20(year), ["Indonesia"] + compared))
+    return _view(charts={"g20": chart}, metrics=metrics)
+
+
+@spans.timed
+def pdb_summary(year):
+    chart = spec_cache.get("pdb_comparison", (year,), (PDB_FILE,),
+                           lambda: charts.makePDBComparisonChart(_as_int64(PDB_FILE), year))
+    return _view(
+        charts={"pdb_comparison": chart},
+        lines=_top_lines(PDB_FILE, "lapangan_usaha", year),
+    )
+
+
+@spans.timed
+def impor_summary(year):
+    chart = spec_cache.get("impor_bar", (year,), (IMPOR_FILE,),
+                           lambda: charts.makeImporBarChart(_as_int64(IMPOR_FILE), year))
+    return _view(
+        charts={"impor_bar": chart},
+        lines=_top_lines(IMPOR_FILE, "golongan_sitc", year),
+    )
+
+
+def pdb_breakdown(year, k=None):
+    table = topk.load(PDB_FILE, "lapangan_usaha")
+    return table.top(year, k or len(table.labels))
+
+
+def impor_breakdown(year, k=None):
+    table = topk.load(IMPOR_FILE, "golongan_sitc")
+    return table.top(year, k or len(table.labels))
+
+
+def correlated_imports(usaha, min_r=correlation.DEFAULT_MIN_R):
+    # import categories whose yearly series correlate with the sector above min_r
+    row = correlation.load(PDB_FILE, IMPOR_FILE).row(usaha)
+    return row[row > min_r]
+
+
+def sector_options():
+    return list(data_cache.load(PDB_FILE)['lapangan_usaha'])
+
+
+def impor_options():
+    return list(data_cache.load(IMPOR_FILE)['golongan_sitc'])
+
+
+def _projection(fit, label, last_year, last_value):
+    # forecast rows for one series, starting at the last observed point
+    df = fit.frame(label)
+    start = pd.DataFrame({"year": [last_year], "value": [float(last_value)], "lower": [float(last_value)], "upper": [float(last_value)]})
+    return pd.concat([start, df], ignore_index=True)
+
+
+def _label_row(df, label_column, label):
+    return df[df[label_column] == label].reset_index(drop=True)
+
+
+def _sector_row(df_pdb, usaha):
+    return _label_row(df_pdb, 'lapangan_usaha', usaha)
+
+
+def _sector_series(df_pdb_filtered):
+    return pd.DataFrame({
+        "y": df_pdb_filtered.iloc[0, 1:],
+        "x": df_pdb_filtered.columns[1:]
+    })
+
+
+def _import_rows(df_impor, correlated):
+    return df_impor[df_impor['golongan_sitc'].isin(correlated.index)].reset_index(drop=True)
+
+
+def _import_melted(df_impor_filtered, correlated):
+    series_column = correlated.index
+    impor_by_kategori = df_impor_filtered.set_index('golongan_sitc').T.reset_index(level=0)
+    return pd.melt(impor_by_kategori.reset_index(), id_vars='index', value_vars=series_column)
+
+
+def _sector_projection(fit, usaha, df_pdb_filtered):
+    last_year = fit.years[-1]
+    pdb_forecast = _projection(fit, usaha, last_year, df_pdb_filtered.at[0, last_year])
+    return pdb_forecast.rename(columns={"year": "x", "value": "y"})
+
+
+def _import_projection(fit, df_impor_filtered):
+    last_year = fit.years[-1]
+    if not len(df_impor_filtered):
+        return None
+    return pd.concat([
+        _projection(fit, label, last_year, value).assign(golongan_sitc=label)
+        for label, value in zip(df_impor_filtered['golongan_sitc'], df_impor_filtered[last_year])
+    ], ignore_index=True).rename(columns={"year": "index"})
+
+
+def _series_line(name, path, label_column, label, impor):
+    def build():
+        row = _label_row(data_cache.load(path), label_column, label)
+        return charts.build_line_chart(_sector_series(row), impor=impor)
+
+    return _view(charts={name: spec_cache.get(name, (label,), (path,), build)})
+
+
+# single-series lines of pages/1_Uji_Korelasi.py
+@spans.timed
+def pdb_trend(usaha):
+    return _series_line("pdb_trend", PDB_FILE, 'lapangan_usaha', usaha, False)
+
+
+@spans.timed
+def impor_trend(kategori):
+    return _series_line("impor_trend", IMPOR_FILE, 'golongan_sitc', kategori, True)
+
+
+# Three caches sit on a chart of these views; spec_cache is the source of truth
+# for what is drawn. A chart is first looked up there by (name, parameters, data
+# version); only the charts it misses are built, in one pipeline run, whose memo
+# holds the intermediate frames (not the charts) so a nearby state - another
+# method, another sector - rebuilds only what differs. core.sections then keeps
+# the returned view per session for sections whose widgets did not change. All
+# three key on data_cache versions, so they cannot disagree about the data; after
+# a reload, entries of the old version simply age out.
+def _chart_specs(graph, names, paths, extra=(), **params):
+    # -> ({name: Spec}, {extra node: value})
+    key_params = tuple(params.values())
+    specs = {name: spec_cache.lookup(name, key_params, paths) for name in names}
+    missing = [name for name in names if specs[name] is None]
+    started = time.perf_counter()
+    built = graph.run(missing + list(extra), served=[name for name in names if specs[name] is not None], **params)
+    build_ms = (time.perf_counter() - started) * 1000
+    for name in missing:
+        specs[name] = spec_cache.store(name, key_params, paths, built[name], build_ms / len(missing))
+    return specs, {name: built[name] for name in extra}
+
+
+# sector -> correlated import categories -> charts, with forecasts; each step is
+# memoized by pipeline.py, so switching only the method reuses the filtered and
+# melted frames.
+SECTOR_TREND = (
+    pipeline.Pipeline("sector_trend")
+    .source("pdb", PDB_FILE)
+    .source("impor", IMPOR_FILE)
+    .node("pdb_row", _sector_row, df_pdb=pipeline.ref("pdb"), usaha=pipeline.param("usaha"))
+    .node("pdb_series", _sector_series, df_pdb_filtered=pipeline.ref("pdb_row"))
+    .node("correlated", correlated_imports, reads=(PDB_FILE, IMPOR_FILE), usaha=pipeline.param("usaha"))
+    .node("impor_rows", _import_rows, df_impor=pipeline.ref("impor"), correlated=pipeline.ref("correlated"))
+    .node("impor_melted", _import_melted, df_impor_filtered=pipeline.ref("impor_rows"), correlated=pipeline.ref("correlated"))
+    .node("pdb_fit", forecast.load, reads=(PDB_FILE,), path=PDB_FILE, method=pipeline.param("method"))
+    .node("impor_fit", forecast.load, reads=(IMPOR_FILE,), path=IMPOR_FILE, method=pipeline.param("method"))
+    .node("pdb_forecast", _sector_projection, fit=pipeline.ref("pdb_fit"), usaha=pipeline.param("usaha"), df_pdb_filtered=pipeline.ref("pdb_row"))
+    .node("impor_forecast", _import_projection, fit=pipeline.ref("impor_fit"), df_impor_filtered=pipeline.ref("impor_rows"))
+    .node("pdb_line", charts.build_line_chart, memo=False, df=pipeline.ref("pdb_series"), forecast=pipeline.ref("pdb_forecast"))
+    .node("impor_layered", charts.make_layered_chart_impor, memo=False, data=pipeline.ref("impor_melted"), forecast=pipeline.ref("impor_forecast"))
+)
+
+
+@spans.timed
+def sector_trend(usaha, method="linear"):
+    specs, _ = _chart_specs(SECTOR_TREND, ["pdb_line", "impor_layered"], (PDB_FILE, IMPOR_FILE), usaha=usaha, method=method)
+    return _view(charts=specs)
+
+
+def lagged_correlation():
+    return correlation.load_lagged(PDB_FILE, IMPOR_FILE)
+
+
+def _lag_profile(usaha):
+    # slices of the precomputed lag stack; nothing is recomputed per sector
+    profile = lagged_correlation().row(usaha).rename_axis("golongan_sitc").reset_index()
+    return profile.melt(id_vars="golongan_sitc", var_name="lag", value_name="r")
+
+
+def _best_frame():
+    return lagged_correlation().best_frame()
+
+
+def _lag_lines(usaha):
+    best = lagged_correlation().best(usaha)
+    return [
+        "{}: lag {:+d} tahun (r = {:.2f})".format(label, int(lag), r)
+        for label, lag, r in zip(best.index, best["lag"], best["r"])
+        if abs(r) > correlation.DEFAULT_MIN_R
+    ]
+
+
+LAG_EXPLORER = (
+    pipeline.Pipeline("lag_explorer")
+    .node("profile", _lag_profile, reads=(PDB_FILE, IMPOR_FILE), usaha=pipeline.param("usaha"))
+    .node("best", _best_frame, reads=(PDB_FILE, IMPOR_FILE))
+    .node("lines", _lag_lines, reads=(PDB_FILE, IMPOR_FILE), usaha=pipeline.param("usaha"))
+    .node("lag_profile", charts.make_lag_profile, memo=False, data=pipeline.ref("profile"))
+    .node("lag_heatmap", charts.make_lag_heatmap, memo=False, data=pipeline.ref("best"), selected=pipeline.param("usaha"))
+)
+
+
+@spans.timed
+def lag_explorer(usaha):
+    specs, nodes = _chart_specs(LAG_EXPLORER, ["lag_profile", "lag_heatmap"], (PDB_FILE, IMPOR_FILE), extra=["lines"], usaha=usaha)
+    return _view(charts=specs, lines=nodes["lines"])
+
+# endregion
+
+
+# region main.py
+
+@spans.timed
+def top20(year):
+    def build():
+        df_gdp_top20 = gdp_top20(year)
+        df_gdp_top20["US$"] = df_gdp_top20["US$"].astype("int64")
+        return charts.makeG20Chart(df_gdp_top20, tooltip_format="$.2s")
+
+    return _view(charts={"top20": spec_cache.get("top20", (year,), (GDP_FILE,), build)})
+
+
+def sector_cube():
+    return cube.load(SECTOR_FILES)
+
+
+def industry_import_scatter(data, ax):
+    import seaborn as sns
+    sns.scatterplot(x=data['industry_value'], y=data['import_goods_value'], ax=ax)
+
+
+def correlation_heatmap(data, ax, annot):
+    import seaborn as sns
+    sns.heatmap(data, annot=annot, ax=ax)
+
+
+@spans.timed
+def sector_comparison(start_year, end_year, comparison_countries=()):
+    sectors = sector_cube()
+    pd_merged = sectors.frame("Indonesia", start_year, end_year).astype(SECTOR_DTYPES)
+
+    if comparison_countries:
+        selected_countries = ["Indonesia"] + list(dict.fromkeys(comparison_countries))
+        df2 = sectors.long_frame(selected_countries, start_year, end_year, ["agri_value", "industry_value"]).dropna()
+        df2["value"] = df2["value"].astype("int32")
+        df2["variable"] = df2["variable"] + " (" + df2["country"] + ")"
+    else:
+        var = pd_merged.loc[:, ["year", "agri_value", "industry_value"]]
+        df2 = pd.melt(var.reset_index(), id_vars='year',value_vars=['agri_value','industry_value'])
+
+    sector_window_stats = windowed.for_cube(sectors, "Indonesia", SLIDER_YEARS[0], SLIDER_YEARS[-1], dtype="int32")
+    return _view(
+        charts={"sector": charts.make_sector_chart(df2)},
+        images={
+            "scatter": figure_cache.render(industry_import_scatter, pd_merged.loc[:, ['industry_value', 'import_goods_value']]),
+            "heatmap": figure_cache.render(correlation_heatmap, sector_window_stats.matrix(start_year, end_year), annot=True),
+        },
+    )
+
+
+@spans.timed
+def detail_periods():
+    return list(hs_imports.periods())
+
+
+def detail_import(period, k=20):
+    def build():
+        year, first, last = hs_imports.periods()[period]
+        df_selected = hs_imports.top(year, first, last, k).rename(columns = {'value': "Million US$"})
+        return charts.makeDetailImportChart(df_selected)
+
+    return _view(charts={"detail_import": spec_cache.get("detail_import", (period, k), (DETAIL_IMPORT_INDEX,), build)})
+
+# endregion
+
+
+def warm():
+    # Builds the derived structures the views read; reloader.py calls this for
+    # each new snapshot before publishing it.
+    gdp_ranking()
+    topk.load(PDB_FILE, "lapangan_usaha")
+    topk.load(IMPOR_FILE, "golongan_sitc")
+    correlation.load(PDB_FILE, IMPOR_FILE)
+    lagged_correlation()
+    for method, _ in FORECAST_METHODS:
+        forecast.load(PDB_FILE, method)
+        forecast.load(IMPOR_FILE, method)
+    windowed.for_cube(sector_cube(), "Indonesia", SLIDER_YEARS[0], SLIDER_YEARS[-1], dtype="int32")
+
+
+def _single(options):
+    return lambda: [(option,) for option in (options() if callable(options) else options)]
+
+
+def _sector_methods():
+    return [(usaha, method) for usaha in sector_options() for method, _ in FORECAST_METHODS]
+
+
+def _year_ranges():
+    return [(start, end) for i, start in enumerate(SLIDER_YEARS) for end in SLIDER_YEARS[i:]]
+
+
+# view name -> (function, every widget state as argument tuples, files read)
+VIEWS = {
+    "g20": (g20, _single(YEARS), (GDP_FILE,)),
+    "pdb_summary": (pdb_summary, _single(YEARS), (PDB_FILE,)),
+    "impor_summary": (impor_summary, _single(YEARS), (IMPOR_FILE,)),
+    "sector_trend": (sector_trend, _sector_methods, (PDB_FILE, IMPOR_FILE)),
+    "lag_explorer": (lag_explorer, _single(sector_options), (PDB_FILE, IMPOR_FILE)),
+    "pdb_trend": (pdb_trend, _single(sector_options), (PDB_FILE,)),
+    "impor_trend": (impor_trend, _single(impor_options), (IMPOR_FILE,)),
+    "top20": (top20, _single(TOP20_YEARS), (GDP_FILE,)),
+    "sector_comparison": (sector_comparison, _year_ranges, tuple(path for _, path in SECTOR_FILES)),
+    "detail_import": (detail_import, _single(detail_periods), (DETAIL_IMPORT_INDEX,)),
+}
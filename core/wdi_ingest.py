@@ -0,0 +1,187 @@
+import argparse
+import os
+import resource
+import shutil
+import sys
+import time
+
+import pandas as pd
+
+from . import data_store
+
+# Streaming ingester for the World Bank WDI bulk export (WDIData.csv / WDICSV.csv).
+#
+# The bulk file has the same wide layout as the per-indicator downloads in
+# data_source/ (Country Name, Country Code, Indicator Name, Indicator Code,
+# 1960 ... 2021), just with every indicator stacked: ~1,400 indicators x 266
+# countries, several hundred MB. It is read in chunks sized from a memory ceiling,
+# each chunk is filtered to the wanted indicators/countries and appended to one
+# CSV per indicator under data_source/wdi/, so only one chunk is ever held in
+# memory. The output files are ordinary World Bank files: data_cache.load(),
+# ranking.load() and cube.load() read them like the hand-downloaded ones, and
+# `python -m core.data_store build` compiles them with the rest of data_source/.
+#
+# The indicators the dashboards use are then copied over the files the views
+# read (DASHBOARD_INDICATORS, same column layout), each in a single rename, so
+# the views and a running reloader.py pick up the bulk data unchanged. That is
+# skipped when the run keeps only some countries (-c), which would drop the rest
+# from the G20 ranking, or with --no-publish.
+#
+#   python -m core.wdi_ingest WDIData.csv                      # indicators the dashboards use
+#   python -m core.wdi_ingest WDIData.csv -i all --memory-mb 128
+#   python -m core.wdi_ingest WDIData.csv -i NY.GDP.PCAP.CD -c IDN MYS THA
+
+OUTPUT_DIR = os.path.join("data_source", "wdi")
+ID_COLUMNS = ["Country Name", "Country Code", "Indicator Name", "Indicator Code"]
+
+# Indicator code -> the data_source/ file the dashboards read it from.
+DASHBOARD_INDICATORS = {
+    "NY.GDP.MKTP.CD": "gdp_dollar.csv",
+    "NY.GDP.MKTP.KD.ZG": "GDP_GROWTH.csv",
+    "NV.AGR.TOTL.ZS": "AGRI_GDP_VALUE.csv",
+    "NV.IND.TOTL.ZS": "INDUSTRY_VALUE.csv",
+    "NE.IMP.GNFS.ZS": "IMPORT_GOOD_VALUE.csv",
+}
+
+DEFAULT_MEMORY_MB = 64
+# pandas needs a few times the final frame size while parsing a chunk
+# (tokenizer buffers, intermediate object arrays).
+PARSE_OVERHEAD = 4
+TEXT_BYTES_PER_ROW = 4 * 100
+
+
+def path(indicator_code, output_dir=OUTPUT_DIR):
+    return os.path.join(output_dir, "{}.csv".format(indicator_code))
+
+
+def _columns(bulk_path):
+    header = pd.read_csv(bulk_path, nrows=0).columns
+    missing = [column for column in ID_COLUMNS if column not in header]
+    if missing:
+        raise ValueError("{} is not a WDI bulk file (missing {})".format(bulk_path, ", ".join(missing)))
+    # the bulk export ends every line with a comma, which pandas reads as an
+    # extra "Unnamed: N" column
+    return ID_COLUMNS + [column for column in header if column.isdigit()]
+
+
+def chunk_rows(year_count, memory_mb=DEFAULT_MEMORY_MB):
+    row_bytes = (8 * year_count + TEXT_BYTES_PER_ROW) * PARSE_OVERHEAD
+    return max(1000, int(memory_mb * 1024 * 1024 // row_bytes))
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def publish(output_dir=OUTPUT_DIR, source_dir=data_store.SOURCE_DIR):
+    # -> the dashboard files replaced by ingested indicators
+    published = []
+    for code, file_name in DASHBOARD_INDICATORS.items():
+        if not os.path.exists(path(code, output_dir)):
+            continue
+        target = os.path.join(source_dir, file_name)
+        # not *.csv until the rename, so neither the reloader nor the store sees it half-copied
+        shutil.copyfile(path(code, output_dir), target + ".tmp")
+        os.replace(target + ".tmp", target)
+        published.append(target)
+    return published
+
+
+def ingest(bulk_path, output_dir=OUTPUT_DIR, indicators=None, countries=None, memory_mb=DEFAULT_MEMORY_MB, progress=True,
+           source_dir=data_store.SOURCE_DIR):
+    # indicators / countries: iterables of codes, None keeps everything;
+    # source_dir: where the dashboard files are published, None to leave them
+    columns = _columns(bulk_path)
+    year_columns = columns[len(ID_COLUMNS):]
+    rows_per_chunk = chunk_rows(len(year_columns), memory_mb)
+    indicators = None if indicators is None else frozenset(indicators)
+    countries = None if countries is None else frozenset(countries)
+
+    # Files are appended to in a staging directory and swapped in at the end, so
+    # an interrupted run never leaves half-written indicators in data_source/.
+    staging_dir = output_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    stats = {"rows_read": 0, "rows_kept": 0, "chunks": 0, "chunk_rows": rows_per_chunk, "indicators": 0}
+    written = set()
+    started = time.perf_counter()
+    reader = pd.read_csv(
+        bulk_path,
+        usecols=columns,
+        dtype={**{column: str for column in ID_COLUMNS}, **{column: "float64" for column in year_columns}},
+        chunksize=rows_per_chunk,
+    )
+    for chunk in reader:
+        stats["rows_read"] += len(chunk)
+        stats["chunks"] += 1
+
+        keep = None
+        if indicators is not None:
+            keep = chunk["Indicator Code"].isin(indicators)
+        if countries is not None:
+            in_countries = chunk["Country Code"].isin(countries)
+            keep = in_countries if keep is None else keep & in_countries
+        if keep is not None:
+            chunk = chunk[keep.to_numpy()]
+
+        for code, rows in chunk.groupby("Indicator Code", sort=False):
+            first = code not in written
+            rows.loc[:, columns].to_csv(path(code, staging_dir), mode="w" if first else "a", header=first, index=False)
+            written.add(code)
+        stats["rows_kept"] += len(chunk)
+
+        if progress:
+            elapsed = time.perf_counter() - started
+            print("\rchunk {:>5}  {:>10,} rows read  {:>8,} kept  {:>9,.0f} rows/s  peak {:>6.0f} MB".format(
+                stats["chunks"], stats["rows_read"], stats["rows_kept"], stats["rows_read"] / elapsed, _peak_rss_mb(),
+            ), end="", file=sys.stderr)
+    if progress:
+        print(file=sys.stderr)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(staging_dir, output_dir)
+    stats["published"] = publish(output_dir, source_dir) if source_dir is not None and countries is None else []
+
+    elapsed = time.perf_counter() - started
+    stats.update(
+        indicators=len(written),
+        seconds=elapsed,
+        rows_per_second=stats["rows_read"] / elapsed if elapsed else 0.0,
+        mb_per_second=os.path.getsize(bulk_path) / (1024 * 1024) / elapsed if elapsed else 0.0,
+        peak_rss_mb=_peak_rss_mb(),
+    )
+    if indicators is not None:
+        stats["missing"] = sorted(indicators - written)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the WDI bulk CSV into per-indicator World Bank files.")
+    parser.add_argument("bulk_path", help="WDIData.csv / WDICSV.csv from the World Bank bulk download")
+    parser.add_argument("-o", "--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("-i", "--indicators", nargs="+", default=list(DASHBOARD_INDICATORS),
+                        help="indicator codes to keep, or 'all' (default: the ones the dashboards use)")
+    parser.add_argument("-c", "--countries", nargs="+", help="ISO-3 codes to keep (default: every row, aggregates included)")
+    parser.add_argument("--memory-mb", type=float, default=DEFAULT_MEMORY_MB, help="memory budget for one parsed chunk")
+    parser.add_argument("--no-publish", action="store_true", help="do not replace the files the dashboards read")
+    args = parser.parse_args()
+
+    indicators = None if args.indicators == ["all"] else args.indicators
+    stats = ingest(args.bulk_path, args.output_dir, indicators, args.countries, args.memory_mb,
+                   source_dir=None if args.no_publish else data_store.SOURCE_DIR)
+
+    print("{:,} rows read, {:,} kept in {} indicator files ({} chunks of {:,} rows)".format(
+        stats["rows_read"], stats["rows_kept"], stats["indicators"], stats["chunks"], stats["chunk_rows"]))
+    print("{:.1f} s  {:,.0f} rows/s  {:.1f} MB/s  peak RSS {:.0f} MB".format(
+        stats["seconds"], stats["rows_per_second"], stats["mb_per_second"], stats["peak_rss_mb"]))
+    if stats["published"]:
+        print("dashboard files replaced: {}".format(", ".join(stats["published"])))
+    if stats.get("missing"):
+        print("not found in the bulk file: {}".format(", ".join(stats["missing"])))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# Pearson correlation over any [start, end] year window in constant time.
+#
+# For k series over T years we keep prefix sums of x, x^2 and x_i * x_j (for every
+# pair), so the sums of any window are a difference of two prefix entries. The
+# full triangle of windows (every start <= end) is precomputed for every pair as
+# a (k, k, T, T) array; windows shorter than two years, with a missing year or
+# in which either series is constant are NaN.
+
+# relative to n * sum(x^2): below this the window's variance is cancellation noise
+VARIANCE_TOLERANCE = 1e-12
+
+
+class WindowedPearson:
+    def __init__(self, values, labels, years):
+        values = np.asarray(values, dtype="float64")
+        self.labels = list(labels)
+        self.years = [str(year) for year in years]
+        self.label_index = {label: i for i, label in enumerate(self.labels)}
+        self.year_index = {year: i for i, year in enumerate(self.years)}
+
+        # Pearson r is shift invariant; centring first keeps the prefix sums small
+        # for large-magnitude series such as GDP in US$.
+        missing = np.isnan(values)
+        values = values - np.nanmean(values, axis=1, keepdims=True)
+        values = np.where(missing, 0.0, values)
+
+        def prefix(a):
+            return np.concatenate([np.zeros(a.shape[:-1] + (1,)), np.cumsum(a, axis=-1)], axis=-1)
+
+        missing_sum = prefix(missing.astype("float64"))
+        value_sum = prefix(values)
+        square_sum = prefix(values ** 2)
+        cross_sum = prefix(values[:, None, :] * values[None, :, :])
+
+        # Every (start, end) pair at once: prefix positions start and end + 1.
+        starts = np.arange(len(self.years))[:, None]
+        stops = np.arange(len(self.years))[None, :] + 1
+        n = (stops - starts).astype("float64")
+
+        def window(prefix):
+            return prefix[..., stops] - prefix[..., starts]
+
+        sum_x = window(value_sum)
+        square = window(square_sum)
+        cross = window(cross_sum)
+        missing = window(missing_sum)
+        missing = missing[:, None] + missing[None, :]
+        sum_a, sum_b = sum_x[:, None], sum_x[None, :]
+        square_a, square_b = square[:, None], square[None, :]
+
+        # n * sum(x^2) - sum(x)^2 cancels to rounding noise (or below zero) when a
+        # window is constant; like DataFrame.corr, those windows have no r.
+        variance_a = n * square_a - sum_a ** 2
+        variance_b = n * square_b - sum_b ** 2
+        flat = (variance_a <= VARIANCE_TOLERANCE * n * square_a) | (variance_b <= VARIANCE_TOLERANCE * n * square_b)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = np.clip((n * cross - sum_a * sum_b) / np.sqrt(variance_a * variance_b), -1.0, 1.0)
+        self.triangle = np.where((missing > 0) | (n < 2) | flat, np.nan, r)
+
+    def pearson(self, a, b, start, end):
+        return self.triangle[self.label_index[a], self.label_index[b], self.year_index[str(start)], self.year_index[str(end)]]
+
+    def matrix(self, start, end):
+        values = self.triangle[:, :, self.year_index[str(start)], self.year_index[str(end)]]
+        return pd.DataFrame(values, index=self.labels, columns=self.labels)
+
+    def window_triangle(self, a, b):
+        values = self.triangle[self.label_index[a], self.label_index[b]]
+        return pd.DataFrame(values, index=self.years, columns=self.years)
+
+
+_lock = threading.Lock()
+_by_cube = weakref.WeakKeyDictionary()
+
+
+def for_cube(indicator_cube, country, start, end, dtype=None):
+    # dtype lets callers correlate the same values they display (main.py shows
+    # the indicators cast to int32).
+    key = (country, str(start), str(end), dtype)
+    with _lock:
+        cached = _by_cube.setdefault(indicator_cube, {}).get(key)
+    if cached is not None:
+        return cached
+
+    values = indicator_cube.window(country, start, end)
+    if dtype is not None:
+        values = values.astype(dtype)
+    stats = WindowedPearson(values, indicator_cube.indicators, indicator_cube.window_years(start, end))
+    with _lock:
+        _by_cube[indicator_cube][key] = stats
+    return stats
@@ -0,0 +1,250 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core import data_cache
+from core import views
+
+# Static export of every widget state of the multi-page app (main.py and pages/).
+#
+#   python export.py                      # every state into export/
+#   python export.py --incremental        # only states whose inputs changed
+#   python export.py -j 4 -o /srv/www/dashboard
+#
+# Each state of each view in views.VIEWS is rendered once, in a process pool, to
+# states/<view>/<slug>.json (Vega-Lite specs, metrics, text lines) plus one PNG per
+# matplotlib figure. manifest.json lists every state with the hash of its inputs
+# and index.html is a self-contained viewer (vega-embed from a CDN), so the bundle
+# can be served by any static file server or CDN with no Python per request.
+#
+# A state's hash covers its view, its widget values, the SHA-1 of every data file
+# the view reads and the source of the core modules views.py imports; the
+# incremental mode skips states whose hash is unchanged.
+
+OUTPUT_DIR = "export"
+MANIFEST_FILE = "manifest.json"
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _code_version():
+    digest = hashlib.sha1()
+    for name, module in sorted(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if not path or not path.endswith(".py") or os.path.abspath(path) == os.path.abspath(__file__):
+            continue
+        if os.path.abspath(path).startswith(REPO_DIR + os.sep):
+            with open(path, "rb") as f:
+                digest.update(name.encode())
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _slug(args):
+    text = re.sub(r"[^A-Za-z0-9]+", "-", "_".join(args)).strip("-")[:60]
+    return "{}-{}".format(text, hashlib.sha1(json.dumps(args).encode()).hexdigest()[:8])
+
+
+def states():
+    # -> [(view, args, inputs)]
+    result = []
+    for name, (_, view_states, inputs) in views.VIEWS.items():
+        for args in view_states():
+            result.append((name, list(args), inputs))
+    return result
+
+
+def _state_id(name, args):
+    # same string as JSON.stringify([view, args]) in index.html
+    return json.dumps([name, args], separators=(",", ":"), ensure_ascii=False)
+
+
+def _state_key(name, args, inputs, code_version):
+    digest = hashlib.sha1()
+    digest.update(json.dumps([name, args, code_version]).encode())
+    for path in inputs:
+        digest.update(data_cache.version(path).encode())
+    return digest.hexdigest()
+
+
+def _render(job):
+    # Runs in a worker process: one widget state -> its JSON file and images.
+    name, args, out_dir = job
+    started = time.perf_counter()
+    view = views.VIEWS[name][0](*args)
+
+    state_dir = os.path.join(out_dir, "states", name)
+    os.makedirs(state_dir, exist_ok=True)
+    slug = _slug(args)
+    images = {}
+    for image_name, data in view["images"].items():
+        images[image_name] = "{}.{}.png".format(slug, image_name)
+        with open(os.path.join(state_dir, images[image_name]), "wb") as f:
+            f.write(data)
+
+    state = {
+        "view": name,
+        "args": args,
+        "charts": {chart_name: chart.to_dict() for chart_name, chart in view["charts"].items()},
+        "images": images,
+        "metrics": [list(metric) for metric in view["metrics"]],
+        "lines": view["lines"],
+    }
+    path = os.path.join(state_dir, slug + ".json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+    return "states/{}/{}.json".format(name, slug), (time.perf_counter() - started) * 1000
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"states": {}}
+
+
+def export(out_dir=OUTPUT_DIR, workers=None, incremental=False, verbose=True):
+    started = time.perf_counter()
+    code_version = _code_version()
+    previous = _load_manifest(out_dir)["states"]
+
+    manifest = {"code_version": code_version, "views": {}, "states": {}}
+    jobs = []
+    keys = {}
+    for name, args, inputs in states():
+        state_id = _state_id(name, args)
+        key = _state_key(name, args, inputs, code_version)
+        manifest["views"].setdefault(name, []).append(args)
+        old = previous.get(state_id)
+        if incremental and old is not None and old["key"] == key and os.path.exists(os.path.join(out_dir, old["file"])):
+            manifest["states"][state_id] = old
+        else:
+            jobs.append((name, args, out_dir))
+            keys[state_id] = key
+
+    timings = {}
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (name, args, _), (path, elapsed_ms) in zip(jobs, pool.map(_render, jobs, chunksize=8)):
+                state_id = _state_id(name, args)
+                manifest["states"][state_id] = {"file": path, "key": keys[state_id]}
+                timings.setdefault(name, []).append(elapsed_ms)
+
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    os.makedirs(out_dir, exist_ok=True)
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    with open(os.path.join(out_dir, "index.html"), "w") as f:
+        f.write(INDEX_HTML)
+
+    stale = [state for state_id, state in previous.items() if state_id not in manifest["states"]]
+    for state in stale:
+        _remove_state(out_dir, state["file"])
+
+    wall_ms = (time.perf_counter() - started) * 1000
+    if verbose:
+        for name, values in timings.items():
+            print("{:<20} {:>4} states  {:>8.1f} ms total  {:>6.1f} ms mean".format(
+                name, len(values), sum(values), sum(values) / len(values)))
+        print("{} states: {} rendered, {} unchanged, {} removed in {:.1f} ms".format(
+            len(manifest["states"]), len(jobs), len(manifest["states"]) - len(jobs), len(stale), wall_ms))
+    return {"rendered": len(jobs), "states": len(manifest["states"]), "removed": len(stale), "wall_ms": wall_ms}
+
+
+def _remove_state(out_dir, file):
+    state_path = os.path.join(out_dir, file)
+    try:
+        with open(state_path) as f:
+            images = json.load(f)["images"].values()
+        for image in images:
+            os.remove(os.path.join(os.path.dirname(state_path), image))
+        os.remove(state_path)
+    except (FileNotFoundError, ValueError):
+        pass
+
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>PDB &amp; Impor Indonesia</title>
+<script src="https://cdn.jsdelivr.net/npm/vega@5"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-lite@4"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-embed@6"></script>
+<style>
+  body { font-family: sans-serif; max-width: 960px; margin: 2rem auto; color: #31333F; }
+  section { margin-bottom: 3rem; }
+  select { margin: 0 .5rem 1rem 0; }
+  .metric { display: inline-block; margin-right: 2rem; }
+  .metric b { display: block; font-size: 1.6rem; }
+  img { max-width: 48%; }
+</style>
+</head>
+<body>
+<div id="views"></div>
+<script>
+fetch("manifest.json").then(r => r.json()).then(manifest => {
+  const byArgs = {};
+  for (const [id, state] of Object.entries(manifest.states)) byArgs[id] = state.file;
+
+  for (const [view, states] of Object.entries(manifest.views)) {
+    const section = document.createElement("section");
+    section.innerHTML = "<h2>" + view + "</h2>";
+    const selects = states[0].map((_, i) => {
+      const select = document.createElement("select");
+      [...new Set(states.map(args => args[i]))].forEach(value => select.add(new Option(value, value)));
+      section.appendChild(select);
+      return select;
+    });
+    const body = document.createElement("div");
+    section.appendChild(body);
+    document.getElementById("views").appendChild(section);
+
+    const show = () => {
+      const file = byArgs[JSON.stringify([view, selects.map(s => s.value)])];
+      if (!file) { body.textContent = "(no data for this selection)"; return; }
+      const dir = file.substring(0, file.lastIndexOf("/") + 1);
+      fetch(file).then(r => r.json()).then(state => {
+        body.innerHTML = "";
+        for (const [label, value, delta] of state.metrics) {
+          body.insertAdjacentHTML("beforeend", "<span class='metric'>" + label + "<b>" + value + "</b>" + delta + "</span>");
+        }
+        for (const line of state.lines) body.insertAdjacentHTML("beforeend", "<p>" + line + "</p>");
+        for (const spec of Object.values(state.charts)) {
+          const div = document.createElement("div");
+          body.appendChild(div);
+          vegaEmbed(div, spec, {actions: false});
+        }
+        for (const image of Object.values(state.images)) {
+          body.insertAdjacentHTML("beforeend", "<img src='" + dir + image + "'>");
+        }
+      });
+    };
+    selects.forEach(s => s.addEventListener("change", show));
+    show();
+  }
+});
+</script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render every widget state into a static bundle.")
+    parser.add_argument("-o", "--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--incremental", action="store_true", help="only re-render states whose inputs changed")
+    args = parser.parse_args()
+    export(args.output_dir, args.workers, args.incremental)
+
+
+if __name__ == "__main__":
+    main()
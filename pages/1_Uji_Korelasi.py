@@ -0,0 +1,185 @@
+import streamlit as st
+from PIL import Image
+from core import data_cache
+from core import spans
+from core import reloader
+from core import spec_cache
+from core import charts
+from core import views
+
+spans.begin_rerun("pages/1_Uji_Korelasi.py")
+reloader.start(views.warm, sources=views.SOURCES)
+data_snapshot = data_cache.pin()
+
+# region (page config)
+spans.begin("page config")
+st.set_page_config(layout="wide")
+padding_top = 1
+
+st.markdown(f"""
+    <style>
+        .main .block-container{{
+            padding-top: {padding_top}rem !important;
+        }}
+    </style>""",
+    unsafe_allow_html=True,
+)
+spans.end()
+# endregion
+
+# region (Header)
+spans.begin("Header")
+banner_image = Image.open("assets/images/centered_banner_wide.jpg")
+st.image(banner_image)
+st.title("Angka PDB Indonesia Tinggi, Mengapa Angka Impor Semakin Meningkat?")
+st.caption("Diposting pada 3 Agustus, 2022, at 11:32 p.m. WIB")
+st.markdown("<div style='position: absolute; color: #84858C; font-size: 0.9rem'>oleh Muhammad Rizky Ridwan Fauzi</div>", unsafe_allow_html=True)
+spans.end()
+# endregion
+
+# region (quote)
+spans.begin("quote")
+st.markdown("<center style='padding: 2.8rem 2rem; font-size: 1.2rem;'>“Indonesia memiliki penduduk 262 juta jiwa membutuhkan pangan yang amat banyak.  Ketergantungan pada impor pangan beresiko besar terhadap ketahanan pangan dan akan mengancam kedaulatan kebijakan pangan NKRI” — Prima Gandhi, SP, MSi</center>", unsafe_allow_html=True)
+spans.end()
+# endregion
+
+# region (body1: top 20)
+spans.begin("body1: top 20")
+if 'chosen_year' not in st.session_state:
+    st.session_state.chosen_year = "2021"
+
+col_lead1, col_lead2 = st.columns([6,1])
+
+with col_lead2:
+    select_box_value = st.selectbox(
+     'Pilih Tahun:',
+     views.YEARS)
+    if select_box_value:
+        st.session_state.chosen_year = select_box_value
+
+    g20_view = views.g20(select_box_value)
+    for label, value, delta in g20_view["metrics"]:
+        st.metric(label, value=value, delta=delta)
+
+with col_lead1:
+    charts.altair_chart(g20_view["charts"]["g20"], "g20", use_container_width=True)
+spans.end()
+# endregion
+
+# region (body2: revision)
+spans.begin("body2: revision")
+if 'chosen_year_pdb' not in st.session_state:
+    st.session_state.chosen_year_pdb = "2021"
+
+col_body2_1, col_body2_2 = st.columns([5, 6])
+with col_body2_1:
+    chosen_year_pdb_selectbox = st.selectbox("Tahun", views.YEARS)
+    st.session_state.chosen_year_pdb = chosen_year_pdb_selectbox
+    pdb_view = views.pdb_summary(st.session_state.chosen_year_pdb)
+    st.write("Indonesia Berada di posisi 20 Besar atau G20 dalam peringkat PDB Dunia. Untuk mengetahui Nilai PDB dalam berbagai lapangan usaha dapat dilihat dalam diagram disamping!")
+    with st.expander("3 Lapangan Usaha Terbesar"):
+        for line in pdb_view["lines"]:
+            st.write(line)
+     
+with col_body2_2:
+    charts.altair_chart(pdb_view["charts"]["pdb_comparison"], "pdb_comparison", use_container_width=True)
+spans.end()
+# endregion
+
+# region (body3: Revision (Laju Impor dan Laju PDB))
+spans.begin("body3: Revision (Laju Impor dan Laju PDB)")
+st.write("Melihat 3 Nilai Terbesar PDB diatas, lantas bagaimana laju nilai PDB dan Impor Indonesia? Apakah dengan Meningkatnya PDB laju Impor Juga Ikut Meningkat?")
+st.subheader("Perbandingan Laju PDB & Import")
+st.caption("Berdasarkan data 10 Tahun terakhir (2010 - 2021)")
+
+# data processing
+df_pdb = data_cache.load(views.PDB_FILE)
+df_impor = data_cache.load(views.IMPOR_FILE)
+
+col_body3_1, col_body3_2 = st.columns(2)
+with col_body3_1:
+    lapangan_usaha_selection = df_pdb['lapangan_usaha']
+    lapangan_usaha_selected = st.selectbox("Sektor PDB", lapangan_usaha_selection)
+    charts.altair_chart(views.pdb_trend(lapangan_usaha_selected)["charts"]["pdb_trend"], "pdb_trend", use_container_width=True)
+with col_body3_2:
+    kategori_sitc_selection = df_impor["golongan_sitc"]
+    kategori_sitc_selected = st.selectbox("Sektor Impor", kategori_sitc_selection)
+    charts.altair_chart(views.impor_trend(kategori_sitc_selected)["charts"]["impor_trend"], "impor_trend", use_container_width=True)
+
+st.write("Mengapa hal ini bisa terjadi? di saat angka PDB meningkat yang mengindikasikan bahwa produksi negeri pun meningkat. Hal ini dikarenakan bahwa untuk mendukung proses produksi yang ada diperlukan media dan fasilitas yang mumpuni agar dapat menopang jalannya proses produksi. Lantas seperti apakah korelasi yang terjadi antar variable PDB dan Nilai Impor?")
+spans.end()
+# endregion
+
+# region (body4: Revision (Korelasi Dari Berbagai Variable))
+spans.begin("body4: Revision (Korelasi Dari Berbagai Variable)")
+
+if 'lapangan_usaha_corr_selected' not in st.session_state:
+    st.session_state.lapangan_usaha_corr_selected = ["A. Pertanian, Kehutanan, dan Perikanan", "C. Industri Pengolahan", "F. Perdagangan Besar dan Eceran"]
+
+if 'kategori_sitc_corr_selected' not in st.session_state:
+    st.session_state.kategori_sitc_corr_selected = kategori_sitc_selection[:9]
+
+st.subheader("Uji Korelasi")
+st.caption("Range Data (2010-2021)")
+body4_col1, body4_col2 = st.columns([3,6])
+with body4_col1:
+    lapangan_usaha_corr_selectbox = st.multiselect("Sektor PDB", lapangan_usaha_selection)
+    # st.session_state.lapangan_usaha_corr_selected = st.multiselect("Sektor PDB", lapangan_usaha_selection, default=st.session_state.lapangan_usaha_corr_selected)
+    st.session_state.lapangan_usaha_corr_selected = lapangan_usaha_corr_selectbox
+    
+    kategori_sitc_corr_selectbox = st.multiselect("Sektor Impor", kategori_sitc_selection)
+    # st.session_state.kategori_sitc_corr_selected = st.multiselect("Sektor Impor", kategori_sitc_selection, default=st.session_state.kategori_sitc_corr_selected)
+    st.session_state.kategori_sitc_corr_selected = kategori_sitc_corr_selectbox
+
+with body4_col2:
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+
+    if len(st.session_state.lapangan_usaha_corr_selected) == 0 and len(st.session_state.kategori_sitc_corr_selected) == 0:
+        st.session_state.lapangan_usaha_corr_selected = ["A. Pertanian, Kehutanan, dan Perikanan", "C. Industri Pengolahan", "F. Perdagangan Besar dan Eceran"]
+        st.session_state.kategori_sitc_corr_selected = kategori_sitc_selection[:9]
+
+    impor_transposed = df_impor.query('golongan_sitc in @st.session_state.kategori_sitc_corr_selected').set_index("golongan_sitc").transpose()
+    pdb_transposed = df_pdb.query('lapangan_usaha in @st.session_state.lapangan_usaha_corr_selected').set_index("lapangan_usaha").transpose()
+    
+    df_merged = pdb_transposed.join(impor_transposed)
+    df_merged.columns = df_merged.columns.str.replace(r'(?<=[A-Z0-9]\.).+', '')
+
+    # scoped styling: the pages share one process, and main.py's cached figures
+    # must not pick up this page's font scale
+    with sns.axes_style("darkgrid"), sns.plotting_context("notebook", font_scale=0.5):
+        fig, ax = plt.subplots()
+        sns.heatmap(
+            df_merged.corr(method="pearson"),
+            vmin=df_merged.corr().values.min(), vmax=1, square=True, cmap="YlGnBu", linewidths=0.1, annot=True, annot_kws={"fontsize":4.5},
+            ax=ax,
+        )
+        st.pyplot(fig)
+    plt.close(fig)
+spans.end()
+# endregion
+
+with st.expander("Heatmap Legend:"):
+    cc_1, cc_2 = st.columns(2)
+    with cc_1:
+        st.subheader("Sektor PDB")
+        for key in list(lapangan_usaha_selection):
+            st.write(key)
+        
+    with cc_2:
+        st.subheader("Sektor Impor")
+        for key in list(kategori_sitc_selection):
+            st.write(key)
+
+        
+st.write("Berdasarkan uji korelasi diatas, diketahui bahwa 1 sektor nilai PDB berkorelasi dengan berbagai sektor impor. Hal ini terjadi karena satu sektor nilai PDB memiliki kaitan yang cukup erat dengan nilai impor dari berbagai sektor.")
+
+st.subheader("Sumber")
+st.write("1. BPS (Nilai Impor & PDB)")
+st.write("2. Data World Bank (GDP World)")
+
+st.sidebar.caption(reloader.caption(data_snapshot))
+spec_cache.report()
+charts.report()
+data_cache.unpin()
+spans.end_rerun()
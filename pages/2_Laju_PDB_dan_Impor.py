@@ -0,0 +1,234 @@
+import streamlit as st
+from PIL import Image
+from core import data_cache
+from core import spans
+from core import reloader
+from core import charts
+from core import pipeline
+from core import sections
+from core import spec_cache
+from core import views
+
+spans.begin_rerun("pages/2_Laju_PDB_dan_Impor.py")
+sections.begin_rerun()
+reloader.start(views.warm, sources=views.SOURCES)
+data_snapshot = data_cache.pin()
+
+# region (page config)
+spans.begin("page config")
+st.set_page_config(layout="wide")
+padding_top = 1
+
+st.markdown(f"""
+    <style>
+        .main .block-container{{
+            padding-top: {padding_top}rem !important;
+        }}
+    </style>""",
+    unsafe_allow_html=True,
+)
+spans.end()
+# endregion
+
+# region (Header)
+@sections.section("Header")
+def header_section(section):
+    banner_image = section.compute(Image.open, "assets/images/centered_banner_wide.jpg")
+    st.image(banner_image)
+    st.title("Angka PDB Indonesia Tinggi, Mengapa Angka Impor Semakin Meningkat?")
+    st.caption("Diposting pada 3 Agustus, 2022, at 11:32 p.m. WIB")
+    st.markdown("<div style='position: absolute; color: #84858C; font-size: 0.9rem'>oleh Muhammad Rizky Ridwan Fauzi</div>", unsafe_allow_html=True)
+
+header_section()
+# endregion
+
+# region (quote)
+spans.begin("quote")
+st.markdown("<center style='padding: 2.8rem 2rem; font-size: 1.2rem;'>“Indonesia memiliki penduduk 262 juta jiwa membutuhkan pangan yang amat banyak.  Ketergantungan pada impor pangan beresiko besar terhadap ketahanan pangan dan akan mengancam kedaulatan kebijakan pangan NKRI” — Prima Gandhi, SP, MSi</center>", unsafe_allow_html=True)
+spans.end()
+# endregion
+
+# region (body1: top 20)
+@sections.section("body1: top 20", depends_on=("g20_year", "g20_compared"))
+def top20_section(section):
+    if 'chosen_year' not in st.session_state:
+        st.session_state.chosen_year = "2021"
+
+    col_lead1, col_lead2 = st.columns([6,1])
+
+    with col_lead2:
+        select_box_value = st.selectbox(
+         'Pilih Tahun:',
+         views.YEARS, key="g20_year")
+        if select_box_value:
+            st.session_state.chosen_year = select_box_value
+
+        indonesia_metrics = st.container()
+        top20_countries = section.compute(views.gdp_top20, select_box_value)
+        compared_countries = st.multiselect("Bandingkan Negara", options=list(top20_countries["Country Name"]), key="g20_compared")
+        g20_view = section.compute(views.g20, select_box_value, tuple(compared_countries))
+        with indonesia_metrics:
+            for label, value, delta in g20_view["metrics"][:2]:
+                st.metric(label, value=value, delta=delta)
+        for label, value, delta in g20_view["metrics"][2:]:
+            st.metric(label, value=value, delta=delta)
+
+    with col_lead1:
+        charts.altair_chart(g20_view["charts"]["g20"], "g20", use_container_width=True)
+
+top20_section()
+# endregion
+
+# region (body2: PDB Summarize)
+@sections.section("body2: PDB Summarize", depends_on=("pdb_year",))
+def pdb_section(section):
+    if 'chosen_year_pdb' not in st.session_state:
+        st.session_state.chosen_year_pdb = "2021"
+
+    st.subheader("Perkembangan Nilai PDB")
+    st.caption("Berdasarkan harga konstan 2010")
+    col_body2_1, col_body2_2 = st.columns([5, 6])
+    with col_body2_1:
+        chosen_year_pdb_selectbox = st.selectbox("Tahun", views.YEARS, key="pdb_year")
+        st.session_state.chosen_year_pdb = chosen_year_pdb_selectbox
+        pdb_view = section.compute(views.pdb_summary, st.session_state.chosen_year_pdb)
+        st.write("Indonesia Berada di posisi 20 Besar atau G20 dalam peringkat PDB Dunia. Untuk mengetahui Nilai PDB dalam berbagai lapangan usaha dapat dilihat dalam diagram disamping!")
+        with st.expander("3 Lapangan Usaha Terbesar"):
+            for line in pdb_view["lines"]:
+                st.write(line)
+
+    with col_body2_2:
+        charts.altair_chart(pdb_view["charts"]["pdb_comparison"], "pdb_comparison", use_container_width=True)
+
+pdb_section()
+# endregion
+
+# region (body3: Impor Summarize)
+@sections.section("body3: Impor Summarize", depends_on=("impor_year",))
+def impor_section(section):
+    st.subheader("Perkembangan Nilai Impor")
+    st.caption("Berdasarkan Volume Impor")
+
+    if 'chosen_year_impor' not in st.session_state:
+        st.session_state.chosen_year_impor = "2021"
+
+    col_body3_1, col_body3_2 = st.columns([6, 5])
+    with col_body3_2:
+        chosen_year_impor_selectbox = st.selectbox("Tahun Impor", views.YEARS, key="impor_year")
+        st.session_state.chosen_year_impor = chosen_year_impor_selectbox
+        impor_view = section.compute(views.impor_summary, st.session_state.chosen_year_impor)
+        st.write("Nilai Impor Indonesia tiap tahun juga mengalami peningkatan untuk memenuhi kebutuhan Indonesia.")
+        with st.expander("3 Nilai Impor Terbesar"):
+            for line in impor_view["lines"]:
+                st.write(line)
+
+    with col_body3_1:
+        charts.altair_chart(impor_view["charts"]["impor_bar"], "impor_bar", use_container_width=True)
+
+impor_section()
+# endregion
+
+# region (body3: Revision (Laju Impor dan Laju PDB))
+@sections.section("body3: Revision (Laju Impor dan Laju PDB)", depends_on=("sector", "forecast_method"))
+def sector_section(section):
+    st.write("Melihat 3 Nilai Terbesar PDB diatas, lantas bagaimana laju nilai PDB dan Impor Indonesia? Apakah dengan Meningkatnya PDB laju Impor Juga Ikut Meningkat?")
+    st.subheader("Perbandingan Laju PDB & Import")
+    st.caption("Berdasarkan data 10 Tahun terakhir (2010 - 2021)")
+
+    lapangan_usaha_selected = st.selectbox("Sektor PDB", views.sector_options(), key="sector")
+    forecast_methods = {label: method for method, label in views.FORECAST_METHODS}
+    forecast_method = forecast_methods[st.selectbox("Model proyeksi 2022 - 2025", list(forecast_methods), key="forecast_method")]
+    sector_view = section.compute(views.sector_trend, lapangan_usaha_selected, forecast_method)
+    col_body3_1, col_body3_2 = st.columns(2)
+    with col_body3_1:
+        charts.altair_chart(sector_view["charts"]["pdb_line"], "pdb_line", use_container_width=True)
+    with col_body3_2:
+        charts.altair_chart(sector_view["charts"]["impor_layered"], "impor_layered", use_container_width=True)
+
+    st.write("Berdasarkan kedua diagram diatas dapat disimpulkan bahwa laju 1 nilai PDB berkaitan dengan laju beberapa nilai impor. Hal ini bisa terjadi karena untuk memenuhi komponen yang dibutuhkan produsen dari berbagai lapangan usaha agar dapat menjalankan produksinya.")
+
+    st.subheader("Lag Korelasi PDB & Impor")
+    st.caption("Korelasi pada lag -3 sampai +3 tahun; lag positif berarti impor mendahului PDB")
+    lag_view = section.compute(views.lag_explorer, lapangan_usaha_selected)
+    col_body3_1, col_body3_2 = st.columns(2)
+    with col_body3_1:
+        charts.altair_chart(lag_view["charts"]["lag_profile"], "lag_profile", use_container_width=True)
+    with col_body3_2:
+        charts.altair_chart(lag_view["charts"]["lag_heatmap"], "lag_heatmap", use_container_width=True)
+    for line in lag_view["lines"]:
+        st.write(line)
+
+sector_section()
+# endregion
+
+# region (body4: Revision (Korelasi Dari Berbagai Variable))
+
+# if 'lapangan_usaha_corr_selected' not in st.session_state:
+#     st.session_state.lapangan_usaha_corr_selected = ["A. Pertanian, Kehutanan, dan Perikanan", "C. Industri Pengolahan", "F. Perdagangan Besar dan Eceran"]
+
+# if 'kategori_sitc_corr_selected' not in st.session_state:
+#     st.session_state.kategori_sitc_corr_selected = kategori_sitc_selection[:9]
+
+# st.subheader("Uji Korelasi")
+# st.caption("Range Data (2010-2021)")
+# body4_col1, body4_col2 = st.columns([3,6])
+# with body4_col1:
+#     lapangan_usaha_corr_selectbox = st.multiselect("Sektor PDB", lapangan_usaha_selection)
+#     # st.session_state.lapangan_usaha_corr_selected = st.multiselect("Sektor PDB", lapangan_usaha_selection, default=st.session_state.lapangan_usaha_corr_selected)
+#     st.session_state.lapangan_usaha_corr_selected = lapangan_usaha_corr_selectbox
+#     print(st.session_state.lapangan_usaha_corr_selected)
+    
+#     kategori_sitc_corr_selectbox = st.multiselect("Sektor Impor", kategori_sitc_selection)
+#     # st.session_state.kategori_sitc_corr_selected = st.multiselect("Sektor Impor", kategori_sitc_selection, default=st.session_state.kategori_sitc_corr_selected)
+#     st.session_state.kategori_sitc_corr_selected = kategori_sitc_corr_selectbox
+
+# with body4_col2:
+    
+#     if len(st.session_state.lapangan_usaha_corr_selected) == 0 and len(st.session_state.kategori_sitc_corr_selected) == 0:
+#         st.session_state.lapangan_usaha_corr_selected = ["A. Pertanian, Kehutanan, dan Perikanan", "C. Industri Pengolahan", "F. Perdagangan Besar dan Eceran"]
+#         st.session_state.kategori_sitc_corr_selected = kategori_sitc_selection[:9]
+
+#     impor_transposed = df_impor.query('golongan_sitc in @st.session_state.kategori_sitc_corr_selected').set_index("golongan_sitc").transpose()
+#     pdb_transposed = df_pdb.query('lapangan_usaha in @st.session_state.lapangan_usaha_corr_selected').set_index("lapangan_usaha").transpose()
+    
+#     df_merged = pdb_transposed.join(impor_transposed)
+#     df_merged.columns = df_merged.columns.str.replace(r'(?<=[A-Z0-9]\.).+', '')
+
+#     sns.set(font_scale=0.5)
+#     fig, ax = plt.subplots()
+
+#     sns.heatmap(
+#         df_merged.corr(method="pearson"),
+#         vmin=df_merged.corr().values.min(), vmax=1, square=True, cmap="YlGnBu", linewidths=0.1, annot=True, annot_kws={"fontsize":4.5}
+#     )
+
+#     st.pyplot(fig)
+# endregion
+
+# with st.expander("Heatmap Legend:"):
+#     cc_1, cc_2 = st.columns(2)
+#     with cc_1:
+#         st.subheader("Sektor PDB")
+#         for key in list(lapangan_usaha_selection):
+#             st.write(key)
+        
+#     with cc_2:
+#         st.subheader("Sektor Impor")
+#         for key in list(kategori_sitc_selection):
+#             st.write(key)
+
+        
+# st.write("Berdasarkan uji korelasi diatas, diketahui bahwa 1 sektor nilai PDB berkorelasi dengan berbagai sektor impor. Hal ini terjadi karena satu sektor nilai PDB memiliki kaitan yang cukup erat dengan nilai impor dari berbagai sektor.")
+
+st.subheader("Sumber")
+st.write("1. BPS (Nilai Impor & PDB)")
+st.write("2. Data World Bank (GDP World)")
+
+st.sidebar.caption(reloader.caption(data_snapshot))
+sections.end_rerun()
+sections.report()
+pipeline.report()
+spec_cache.report()
+charts.report()
+data_cache.unpin()
+spans.end_rerun()
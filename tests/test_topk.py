@@ -0,0 +1,29 @@
+import numpy as np
+
+from core import topk
+
+
+def _full_sort(table, column, largest):
+    return sorted(range(len(table.values)), key=lambda row: table.rank(row, column, largest))
+
+
+def test_ties_and_nan_at_the_boundary():
+    table = topk.TopK(np.array([[5.0], [np.nan], [np.nan], [np.nan], [3.0]]), ["c"])
+    assert list(table.rows("c", 3)) == [0, 4, 1]
+    assert list(table.rows("c", 3, largest=False)) == [4, 0, 1]
+
+    values = np.array([[2.0, 1.0], [7.0, np.nan], [2.0, 1.0], [7.0, 1.0], [np.nan, 4.0], [2.0, np.nan], [1.0, 1.0]])
+    table = topk.TopK(values, ["a", "b"])
+    for column in ("a", "b"):
+        for largest in (True, False):
+            order = _full_sort(table, column, largest)
+            for k in range(len(values) + 2):
+                assert list(table.rows(column, k, largest)) == order[:k], (column, largest, k)
+
+
+def test_rows_cache_is_bounded_and_keyed_on_clamped_k():
+    table = topk.TopK(np.arange(10.0)[:, None], ["c"])
+    assert table.rows("c", 10) is table.rows("c", 1000)
+    for k in range(topk.MAX_ROWS * 2):
+        table.rows("c", k, largest=False)
+    assert len(table._rows) <= topk.MAX_ROWS
@@ -0,0 +1,55 @@
+import os
+import shutil
+
+import pandas as pd
+
+from core import views
+from core import wdi_ingest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _bulk_file(tmp_path, scale):
+    # the dashboard indicators stacked as in WDIData.csv, trailing comma included,
+    # plus one indicator no dashboard reads; values scaled so the test can tell
+    # the ingested files from the originals
+    frames = []
+    for file_name in wdi_ingest.DASHBOARD_INDICATORS.values():
+        frames.append(pd.read_csv(os.path.join(REPO_DIR, "data_source", file_name)))
+    other = frames[0].copy()
+    other["Indicator Code"] = "NY.GDP.PCAP.CD"
+    bulk = pd.concat(frames + [other], ignore_index=True)
+    years = [column for column in bulk.columns if column.isdigit()]
+    bulk[years] = bulk[years] * scale
+    bulk[""] = None
+    bulk_path = tmp_path / "WDIData.csv"
+    bulk.to_csv(bulk_path, index=False)
+    return str(bulk_path)
+
+
+def test_views_read_ingested_dashboard_files(tmp_path, monkeypatch):
+    bulk_path = _bulk_file(tmp_path, 2)
+    os.makedirs(tmp_path / "data_source")
+    shutil.copy(os.path.join(REPO_DIR, "data_source", "iso3_codes.txt"), tmp_path / "data_source")
+    original = views.gdp_ranking().value("IDN", "2021")
+
+    monkeypatch.chdir(tmp_path)
+    stats = wdi_ingest.ingest(bulk_path, memory_mb=1, progress=False)
+
+    assert stats["indicators"] == len(wdi_ingest.DASHBOARD_INDICATORS) + 1
+    assert sorted(stats["published"]) == sorted(os.path.join("data_source", name) for name in wdi_ingest.DASHBOARD_INDICATORS.values())
+    assert os.path.exists(wdi_ingest.path("NY.GDP.PCAP.CD"))
+    assert views.gdp_ranking().value("IDN", "2021") == 2 * original
+    g20 = views.g20("2021")
+    assert g20["metrics"][1][1] == "{}/20".format(views.gdp_ranking().rank_of("IDN", "2021") + 1)
+    assert views.sector_comparison("2010", "2021")["charts"]["sector"] is not None
+
+
+def test_country_filter_leaves_dashboard_files(tmp_path, monkeypatch):
+    bulk_path = _bulk_file(tmp_path, 1)
+    os.makedirs(tmp_path / "data_source")
+    monkeypatch.chdir(tmp_path)
+    stats = wdi_ingest.ingest(bulk_path, countries=["IDN"], progress=False)
+
+    assert stats["published"] == []
+    assert not os.path.exists(os.path.join("data_source", "gdp_dollar.csv"))
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from core import views
+from core import windowed
+
+# WindowedPearson against DataFrame.corr for every [start, end] window.
+
+
+def _assert_matches_pandas(stats, df):
+    for i, start in enumerate(stats.years):
+        for end in stats.years[i:]:
+            expected = df.loc[start:end].corr().loc[stats.labels, stats.labels]
+            np.testing.assert_allclose(stats.matrix(start, end).values, expected.values, atol=1e-9,
+                                       err_msg="window {}-{}".format(start, end))
+
+
+def test_constant_windows_are_nan():
+    years = [str(year) for year in range(2000, 2012)]
+    df = pd.DataFrame({
+        "flat_start": [5, 5, 5, 5, 6, 7, 9, 8, 8, 8, 10, 11],
+        "large": [1e6, 1e6, 1e6 + 1, 1e6 + 1, 1e6 + 1, 1e6 + 3, 1e6, 1e6, 1e6, 1e6, 1e6 + 2, 1e6 + 5],
+        "trend": range(12),
+        "constant": [3.0] * 12,
+    }, index=years, dtype="float64")
+    stats = windowed.WindowedPearson(df.T.values, df.columns, years)
+    _assert_matches_pandas(stats, df)
+
+
+def test_sector_windows_match_pandas():
+    cube = views.sector_cube()
+    years = views.SLIDER_YEARS
+    stats = windowed.for_cube(cube, "Indonesia", years[0], years[-1], dtype="int32")
+    values = cube.window("Indonesia", years[0], years[-1]).astype("int32")
+    df = pd.DataFrame(np.asarray(values, dtype="float64").T, index=stats.years, columns=stats.labels)
+    _assert_matches_pandas(stats, df)